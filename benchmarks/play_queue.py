@@ -0,0 +1,56 @@
+# Per-operation cost of PlayQueue on a large queue.
+#
+#   python -m benchmarks.play_queue [entries]
+import random
+import sys
+import time
+
+from src.core.play_queue import PlayQueue
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_op = (time.perf_counter() - start) / repeat
+    unit, scale = ('ms', 1e3) if per_op >= 1e-3 else ('us', 1e6)
+    print(f"{label:24s} {per_op * scale:8.1f} {unit}")
+
+
+def main(count):
+    random.seed(0)
+    queue = PlayQueue()
+    song_ids = list(range(count))
+    middle = count // 2
+
+    timed('load', lambda: queue.load(song_ids, start=middle))
+    timed('next', queue.next, 10_000)
+    timed('jump', lambda: queue.jump(random.randrange(count)), 10_000)
+    timed('insert_next', lambda: queue.insert_next([1]), 1000)
+    timed('append', lambda: queue.append([1]), 1000)
+    timed('move', lambda: queue.move(random.randrange(len(queue)), random.randrange(len(queue))), 1000)
+    timed('remove', lambda: queue.remove(random.randrange(len(queue))), 1000)
+
+    timed('shuffle on', lambda: queue.set_shuffle(True))
+    timed('next (shuffled)', queue.next, 10_000)
+    timed('insert_next (shuffled)', lambda: queue.insert_next([1]), 1000)
+    timed('append (shuffled)', lambda: queue.append([1]), 1000)
+    timed('move (shuffled)', lambda: queue.move(random.randrange(1000), random.randrange(1000)), 1000)
+    timed('remove (shuffled)', lambda: queue.remove(random.randrange(1000)), 1000)
+    timed('unshuffle', lambda: queue.set_shuffle(False))
+
+    # What Player did before PlayQueue: copy the list, shuffle it, and scan
+    # for the current song on every toggle
+    current = queue.current()
+
+    def list_toggle():
+        order = list(song_ids)
+        random.shuffle(order)
+        order.remove(current)
+        order.insert(0, current)
+        song_ids.index(current)
+    timed('list shuffle+unshuffle', list_toggle, 10)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
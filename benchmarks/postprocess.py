@@ -0,0 +1,85 @@
+# Time PostProcessWorker.run for the "mp3" (re-encode) and "native" (remux)
+# formats on locally generated media, so no network is needed. Needs ffmpeg
+# on PATH.
+#
+#   python -m benchmarks.postprocess [tracks] [seconds]
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.core.downloader import PostProcessWorker
+
+SOURCES = {
+    # What YouTube usually serves for bestaudio
+    'webm': ['-c:a', 'libopus', '-b:a', '128k'],
+    'm4a': ['-c:a', 'aac', '-b:a', '128k'],
+}
+
+
+def cpu_time():
+    # ffmpeg runs as a child process
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def ffmpeg(*args):
+    subprocess.run(['ffmpeg', '-v', 'error', '-y', *args], check=True)
+
+
+def make_sources(directory, seconds):
+    ffmpeg('-f', 'lavfi', '-i', 'color=c=steelblue:s=480x360', '-frames:v', '1',
+           os.path.join(directory, 'cover.jpg'))
+    for ext, codec in SOURCES.items():
+        ffmpeg('-f', 'lavfi', '-i', f'sine=frequency=440:duration={seconds}', *codec,
+               os.path.join(directory, f'source.{ext}'))
+
+
+def fake_info(staging, source_dir, ext, index):
+    # The fields yt-dlp's postprocessors read from a real download
+    filepath = os.path.join(staging, f'Track {index}.{ext}')
+    thumbnail = os.path.join(staging, f'Track {index}.jpg')
+    shutil.copy(os.path.join(source_dir, f'source.{ext}'), filepath)
+    shutil.copy(os.path.join(source_dir, 'cover.jpg'), thumbnail)
+    url = f'https://example.invalid/{index}'
+    return {
+        'id': str(index), 'title': f'Track {index}', 'uploader': 'Bench Artist',
+        'ext': ext, 'url': url, 'webpage_url': url,
+        'extractor': 'generic', 'extractor_key': 'Generic',
+        'filepath': filepath,
+        'thumbnails': [{'id': '0', 'url': url + '.jpg', 'filepath': thumbnail}],
+    }
+
+
+def main(tracks, seconds):
+    work = tempfile.mkdtemp(prefix='rebbit-bench-')
+    try:
+        make_sources(work, seconds)
+        for ext in SOURCES:
+            for audio_format in ('mp3', 'native'):
+                staging = tempfile.mkdtemp(dir=work)
+                library = tempfile.mkdtemp(dir=work)
+                infos = [fake_info(staging, work, ext, i) for i in range(tracks)]
+                worker = PostProcessWorker(infos, audio_format, library)
+                wall, cpu = time.perf_counter(), cpu_time()
+                worker.run()
+                wall, cpu = time.perf_counter() - wall, cpu_time() - cpu
+                if not worker.completed:
+                    raise SystemExit(f"{ext}/{audio_format} failed: {worker.error_message}")
+                output = infos[0]['filepath']
+                print(f"{ext:5s} {audio_format:7s} -> {os.path.splitext(output)[1]:6s}"
+                      f" wall {wall / tracks * 1000:6.0f} ms/track"
+                      f" cpu {cpu / tracks * 1000:6.0f} ms/track"
+                      f" {os.path.getsize(output) / 1e6:5.2f} MB"
+                      f" staging left: {len(os.listdir(staging))}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args) if args else main(5, 180)
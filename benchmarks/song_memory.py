@@ -0,0 +1,68 @@
+# Memory held by 100k library rows: plain dict(row) copies (the old model)
+# versus Song records interned through SongRegistry.
+#
+#   python -m benchmarks.song_memory [tracks]
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from pathlib import Path
+
+from src.utils.config import Config
+
+Config.DB_PATH = Path(tempfile.mkdtemp()) / 'bench.db'
+
+from src.database.db_manager import DBManager
+from src.core.song import Song
+
+
+def fake_songs(count):
+    for i in range(count):
+        yield {
+            'title': f'Track title number {i}',
+            'artist': f'Artist {i % 800}',
+            'album': f'Album {i % 8000}',
+            'filepath': f'/home/user/Music/Rebbit/Artist {i % 800}/Track title number {i}.mp3',
+            'cover_path': f'/cache/{i % 8000:032x}.jpg',
+            'duration': 200 + i % 300,
+            'size': 5_000_000 + i,
+            'mtime': 1_700_000_000_000_000_000 + i,
+            'inode': 1000 + i,
+        }
+
+
+def measure(label, count, fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:26s} {current / count:7.0f} B/track {current / 2**20:7.1f} MiB {elapsed * 1000:6.0f} ms")
+    return result
+
+
+def main(count):
+    db = DBManager()
+    db.add_songs(fake_songs(count), 5000)
+    conn = db.get_connection()
+
+    def rows():
+        return conn.execute(f'SELECT {Song.columns()} FROM songs').fetchall()
+
+    dicts = measure('dict(row)', count, lambda: [dict(row) for row in rows()])
+    # The old UI kept the library, the visible list and two queue copies
+    measure('  + 3 list copies', count, lambda: [list(dicts) for _ in range(3)])
+    del dicts
+    songs = measure('Song via registry', count, lambda: db.songs_from(rows()))
+    measure('  + 3 id queues', count, lambda: [array('q', (song.id for song in songs)) for _ in range(3)])
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    # Skip interpreter teardown of the registry and connection pool
+    os._exit(0)
@@ -1,4 +1,5 @@
 import sys
+import locale
 from PySide6.QtWidgets import QApplication
 
 from src.utils.config import Config
@@ -14,6 +15,11 @@ def load_stylesheet(app, theme_file="dark_theme.css"):
         print(f"Warning: Theme file not found at {style_path}")
 
 def main():
+    try:
+        # Library sorting collates with the user's locale
+        locale.setlocale(locale.LC_COLLATE, '')
+    except locale.Error as e:
+        print(f"Warning: Could not set locale: {e}")
     app = QApplication(sys.argv)
     app.setApplicationName(Config.APP_NAME)
     app.setOrganizationName(Config.ORGANIZATION)
@@ -0,0 +1,127 @@
+import os
+import glob
+import time
+import hashlib
+import tempfile
+import mimetypes
+
+from src.utils.config import Config
+from src.database.db_manager import DBManager
+
+class CoverCache:
+    # Covers are named by a hash of their bytes and sharded two levels deep
+    # (cache/ab/cd/abcd....jpg), so every track of an album shares one file
+    # and renaming the audio file never orphans its art.
+
+    @staticmethod
+    def path_for(digest, ext):
+        return Config.COVER_CACHE_DIR / digest[:2] / digest[2:4] / f"{digest}.{ext}"
+
+    @staticmethod
+    def store(data, mime=None):
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        ext = 'png' if mime and 'png' in mime else 'jpg'
+        path = CoverCache.path_for(digest, ext)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Several scan workers may store the same album art at once; write to
+            # a temp file and rename so readers never see a partial image
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as img:
+                    img.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return str(path)
+
+    @staticmethod
+    def store_file(filepath):
+        mime, _ = mimetypes.guess_type(filepath)
+        with open(filepath, 'rb') as img:
+            return CoverCache.store(img.read(), mime)
+
+    @staticmethod
+    def digest_of(path):
+        return DBManager.cover_digest(path)
+
+    @staticmethod
+    def collect_garbage(db, budget=None):
+        budget = Config.COVER_CACHE_BUDGET if budget is None else budget
+        conn = db.get_connection()
+        removed = 0
+
+        # 1. Files in the cache the database doesn't know about (crashed scans,
+        #    the old per-track md5 names, ...). Fresh files are left alone, they
+        #    may have been stored a moment ago and not be registered yet.
+        #    Thumbnails (<digest>_<size>.jpg) live and die with their cover, and
+        #    count towards its size.
+        known = {CoverCache.digest_of(row[0]) for row in conn.execute('SELECT path FROM covers')}
+        sizes = dict.fromkeys(known, 0)
+        cutoff = time.time() - 3600
+        for root, _, files in os.walk(Config.COVER_CACHE_DIR):
+            for name in files:
+                path = os.path.join(root, name)
+                digest = CoverCache.digest_of(path).split('_')[0]
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if digest in known:
+                    sizes[digest] += stat.st_size
+                elif stat.st_mtime < cutoff:
+                    removed += CoverCache.delete_file(path)
+        total = sum(sizes.values())
+        if total <= budget:
+            return removed
+
+        # 2. Over budget: evict the least recently used covers no song points
+        #    at any more. Referenced covers are never evicted; a rescan skips
+        #    unchanged files, so nothing would bring them back.
+        evicted = []
+        for row in conn.execute('SELECT path FROM covers WHERE refcount <= 0 ORDER BY last_used').fetchall():
+            if total <= budget:
+                break
+            removed += CoverCache.delete_cover(row['path'])
+            total -= sizes.get(CoverCache.digest_of(row['path']), 0)
+            evicted.append((row['path'],))
+        with conn:
+            conn.executemany('DELETE FROM covers WHERE path = ? AND refcount <= 0', evicted)
+
+        # 3. Still over: drop thumbnails of the least recently displayed covers.
+        #    ThumbnailService rebuilds them from the cover when next shown.
+        if total > budget:
+            for row in conn.execute('SELECT path FROM covers WHERE refcount > 0 ORDER BY last_used').fetchall():
+                if total <= budget:
+                    break
+                for thumb in CoverCache.thumbnails(row['path']):
+                    try:
+                        size = os.path.getsize(thumb)
+                    except OSError:
+                        continue
+                    if CoverCache.delete_file(thumb):
+                        removed += 1
+                        total -= size
+        return removed
+
+    @staticmethod
+    def thumbnails(path):
+        base, _ = os.path.splitext(path)
+        return glob.glob(glob.escape(base) + '_*.jpg')
+
+    @staticmethod
+    def delete_cover(path):
+        removed = CoverCache.delete_file(path)
+        for thumb in CoverCache.thumbnails(path):
+            removed += CoverCache.delete_file(thumb)
+        return removed
+
+    @staticmethod
+    def delete_file(path):
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
@@ -1,9 +1,32 @@
-from PySide6.QtCore import QObject, Signal
+import os
+import json
+import shutil
+import heapq
+from collections import deque
+from itertools import count
+from PySide6.QtCore import Qt, QObject, Signal, QTimer, QCoreApplication
 
 from src.utils.config import Config
-from src.core.downloader import DownloadWorker
+from src.database.db_manager import DBManager
+from src.core.downloader import DownloadWorker, PostProcessWorker
+from src.core.download_task import DownloadTask, DownloadGroup, TaskState
 
 class DownloadManager(QObject):
+    # Downloads go through two stages. Fetching is network-bound and runs at
+    # most `max_concurrent` tasks; the rest wait in a priority queue (FIFO
+    # within a priority, by seq). Heap entries are never removed in place:
+    # every push gets a new entry number and entries that are no longer the
+    # task's current one are skipped when popped. A resumed task keeps its
+    # seq, so it goes back to its old place rather than to the end.
+    #
+    # Fetched tasks are handed to the CPU-bound post-processing stage
+    # (transcode, cover, tags), which runs one task per core. The hand-off
+    # queue between them is bounded: when it is full a finished fetch keeps
+    # its slot until there is room, so fetching stalls instead of piling up
+    # unconverted files.
+    #
+    # The queue is persisted to the `downloads` table and restored on startup.
+    group_added = Signal(object)
     task_added = Signal(object)
     task_finished = Signal(str)
     _instance = None
@@ -16,25 +39,326 @@ class DownloadManager(QObject):
 
     def __init__(self):
         super().__init__()
-        self.active_tasks = []
-
-    def start_download(self, url, title):
-        save_dir = Config.DEFAULT_MUSIC_DIR
-        worker = DownloadWorker(url, str(save_dir))
-        worker.video_title = title 
-        worker.finished.connect(lambda f: self.on_finished(worker, f))
-        worker.error.connect(lambda e: self.on_error(worker, e))
-        self.active_tasks.append(worker)
-        self.task_added.emit(worker)
+        self.max_concurrent = Config.MAX_CONCURRENT_DOWNLOADS
+        self.audio_format = Config.DOWNLOAD_FORMAT
+        self.tasks = []
+        self.groups = []
+        self.waiting = [] # heap of (-priority, seq, entry, task)
+        self.fetching = set()
+        self.handoff = deque() # fetched, waiting for a post-processing slot
+        self.stalled = deque() # fetched, still holding a fetch slot
+        self.processing = set()
+        self.max_processing = Config.POSTPROCESS_WORKERS
+        self.counter = count()
+
+        self.db = DBManager()
+        self.dirty = set()
+        self.dirty_groups = set()
+        self.flush_pending = False
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+        self.restore()
+
+    @property
+    def active_tasks(self):
+        return [t for t in self.tasks if t.state in (TaskState.WAITING, TaskState.DOWNLOADING, TaskState.PROCESSING, TaskState.PAUSED)]
+
+    def start_download(self, url, title, priority=0):
+        task = self.add_task(url, title, priority)
+        self.schedule()
+        return task
+
+    def start_playlist(self, url, title, entries, priority=0):
+        # One task per entry, so tracks download in parallel and a failed
+        # one can be retried on its own
+        group = DownloadGroup(url, title)
+        self.groups.append(group)
+        self.group_added.emit(group)
+        self.dirty_groups.add(group)
+        for entry in entries:
+            self.add_task(entry['url'], entry.get('title'), priority, group)
+        self.schedule()
+        return group
+
+    def add_task(self, url, title, priority=0, group=None):
+        task = DownloadTask(url, title, priority, self.audio_format)
+        self.track(task, group)
+        self.enqueue(task)
+        return task
+
+    def track(self, task, group=None):
+        if group is not None:
+            group.add(task)
+        self.tasks.append(task)
+        task.state_changed.connect(lambda: self.persist(task))
+        task.files_changed.connect(lambda: self.persist(task))
+        self.task_added.emit(task)
+
+    def restore(self):
+        # Reload the queue saved by a previous run. Anything that was fetching
+        # or converting is queued again: yt-dlp continues its .part files, and
+        # a fetch that had already finished just finds the file in place. A
+        # task that got as far as moving its files into the library is done.
+        try:
+            self.db.prune_downloads()
+            group_rows = self.db.get_download_groups()
+            rows = self.db.get_downloads()
+        except Exception as e:
+            print(f"Could not restore download queue: {e}")
+            return
+
+        groups = {}
+        for row in group_rows:
+            group = DownloadGroup(row['url'], row['title'], row['id'])
+            groups[group.id] = group
+            self.groups.append(group)
+
+        interrupted = []
+        for row in rows:
+            task = DownloadTask(row['url'], row['title'], row['priority'], row['audio_format'], row['id'])
+            task.state = row['state']
+            task.seq = row['seq']
+            task.error = row['error']
+            task.partial_files = set(json.loads(row['partial_files'] or '[]'))
+            # Fetched files are only needed for cleanup; a resumed fetch finds
+            # them in place and yt-dlp reports them again
+            task.partial_files.update(json.loads(row['fetched_files'] or '[]'))
+            task.library_files = json.loads(row['library_files'] or '[]')
+            self.track(task, groups.get(row['group_id']))
+            if task.state == TaskState.PROCESSING and task.library_files and all(
+                    os.path.exists(path) for path in task.library_files):
+                self.remove_partial_files(task)
+                task.set_state(TaskState.COMPLETED)
+            elif task.state in (TaskState.WAITING, TaskState.DOWNLOADING, TaskState.PROCESSING):
+                interrupted.append(task)
+
+        DownloadTask.continue_ids(max((row['id'] for row in rows), default=0))
+        DownloadGroup.continue_ids(max(groups, default=0))
+        self.counter = count(max((row['seq'] for row in rows), default=-1) + 1)
+        for task in interrupted:
+            self.enqueue(task, keep_seq=True)
+        self.schedule()
+
+    def persist(self, task):
+        # Writes are coalesced: everything that changes during one pass of the
+        # event loop (e.g. queueing a whole playlist) is one transaction
+        self.dirty.add(task)
+        if not self.flush_pending:
+            self.flush_pending = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        self.flush_pending = False
+        if not self.dirty and not self.dirty_groups:
+            return
+        groups = [(group.id, group.url, group.title) for group in self.dirty_groups]
+        downloads = [self.download_row(task) for task in self.dirty]
+        self.dirty_groups.clear()
+        self.dirty.clear()
+        self.db.save_downloads(groups, downloads)
+
+    def download_row(self, task):
+        return (
+            task.id,
+            task.group.id if task.group else None,
+            task.url,
+            task.title,
+            task.priority,
+            task.seq,
+            task.state,
+            task.audio_format,
+            json.dumps(sorted(task.partial_files)),
+            json.dumps(task.fetched_files()),
+            json.dumps(task.library_files),
+            task.error,
+        )
+
+    def set_max_concurrent(self, limit):
+        # Lowering the limit lets running downloads finish rather than stopping them
+        self.max_concurrent = max(1, limit)
+        self.schedule()
+
+    def set_audio_format(self, audio_format):
+        # Applies to downloads added from now on
+        self.audio_format = audio_format
+
+    def enqueue(self, task, keep_seq=False):
+        if not keep_seq:
+            task.seq = next(self.counter)
+        task.entry = next(self.counter)
+        heapq.heappush(self.waiting, (-task.priority, task.seq, task.entry, task))
+        task.set_state(TaskState.WAITING)
+
+    def hand_off(self, task):
+        task.set_state(TaskState.PROCESSING)
+        self.fetching.discard(task)
+        if len(self.handoff) < Config.POSTPROCESS_QUEUE_SIZE:
+            self.handoff.append(task)
+        else:
+            self.fetching.add(task)
+            self.stalled.append(task)
+
+    def schedule(self):
+        # Downstream first, so room freed in the hand-off queue releases
+        # stalled fetch slots before new fetches are considered
+        while len(self.processing) < self.max_processing and self.handoff:
+            self.process(self.handoff.popleft())
+        while self.stalled and len(self.handoff) < Config.POSTPROCESS_QUEUE_SIZE:
+            task = self.stalled.popleft()
+            self.fetching.discard(task)
+            self.handoff.append(task)
+        while len(self.fetching) < self.max_concurrent and self.waiting:
+            _, _, entry, task = heapq.heappop(self.waiting)
+            # A task whose worker is still stopping is requeued when it exits
+            if task.state == TaskState.WAITING and entry == task.entry and task.worker is None:
+                self.fetch(task)
+
+    def fetch(self, task):
+        # Fetched files stay out of the watched library until they are converted
+        worker = DownloadWorker(task.url, str(self.staging_dir(task)))
+        worker.progress.connect(task.set_progress)
+        # Persisted as soon as they appear, so a crash mid-fetch still
+        # leaves a record of what to clean up
+        worker.partial_file.connect(task.add_partial_file)
+        worker.finished.connect(lambda: self.on_fetch_finished(task, worker))
+        task.worker = worker
+        task.error = None
+        self.fetching.add(task)
+        task.set_state(TaskState.DOWNLOADING)
         worker.start()
 
-    def on_finished(self, worker, filename):
-        if worker in self.active_tasks:
-            self.active_tasks.remove(worker)
-        self.task_finished.emit(filename)
+    def process(self, task):
+        worker = PostProcessWorker(task.fetched, task.audio_format, str(Config.DEFAULT_MUSIC_DIR))
+        worker.progress.connect(task.set_progress)
+        # Blocking, so the path is on disk before the file is
+        worker.moving.connect(lambda path: self.on_moving(task, path), Qt.BlockingQueuedConnection)
+        worker.finished.connect(lambda: self.on_process_finished(task, worker))
+        task.worker = worker
+        task.error = None
+        self.processing.add(task)
+        worker.start()
+
+    def pause(self, task):
+        # yt-dlp can't pause, so the transfer is aborted and the .part file
+        # kept; resuming continues from it
+        if task.state == TaskState.WAITING:
+            task.set_state(TaskState.PAUSED)
+        elif task.state == TaskState.DOWNLOADING:
+            task.set_state(TaskState.PAUSED)
+            task.worker.abort()
+
+    def resume(self, task):
+        if task.state == TaskState.FAILED and task.fetched:
+            # Failed in post-processing; the fetched files are still there
+            self.hand_off(task)
+            self.schedule()
+        elif task.state in (TaskState.PAUSED, TaskState.FAILED):
+            self.enqueue(task, keep_seq=True)
+            self.schedule()
+
+    def retry_failed(self, group):
+        for task in group.tasks:
+            if task.state == TaskState.FAILED:
+                self.resume(task)
+
+    def cancel_group(self, group):
+        for task in group.tasks:
+            self.cancel(task)
+
+    def cancel(self, task):
+        if task.state in (TaskState.COMPLETED, TaskState.CANCELLED):
+            return
+        running = task.state in (TaskState.DOWNLOADING, TaskState.PROCESSING) and task.worker is not None
+        if task in self.stalled:
+            self.stalled.remove(task)
+            self.fetching.discard(task)
+        elif task in self.handoff:
+            self.handoff.remove(task)
+        task.set_state(TaskState.CANCELLED)
+        if running:
+            task.worker.abort() # files go once the worker has stopped
+        else:
+            self.remove_partial_files(task)
+            self.schedule()
+
+    def move_to_front(self, task):
+        if task.state != TaskState.WAITING:
+            return
+        top = max((-priority for priority, _, _, t in self.waiting if t.state == TaskState.WAITING), default=0)
+        task.priority = max(task.priority, top + 1)
+        self.enqueue(task)
+        self.schedule()
+
+    def staging_dir(self, task):
+        # One folder per task: two downloads of the same title would
+        # otherwise fetch into, and clean up, the same files
+        return Config.DOWNLOAD_STAGING_DIR / str(task.id)
+
+    def remove_partial_files(self, task):
+        # .part files, plus fetched media and thumbnails not yet post-processed
+        leftovers = []
+        for path in task.partial_files:
+            leftovers.append(path)
+            if path.endswith('.part'):
+                leftovers.append(path[:-len('.part')] + '.ytdl')
+        leftovers.extend(task.fetched_files())
+        for leftover in leftovers:
+            if os.path.exists(leftover):
+                try:
+                    os.remove(leftover)
+                except OSError as e:
+                    print(f"Could not remove partial download {leftover}: {e}")
+        shutil.rmtree(self.staging_dir(task), ignore_errors=True)
+        task.partial_files.clear()
+        task.fetched = []
+
+    def on_fetch_finished(self, task, worker):
+        # QThread.finished: the thread is done, so dropping the worker is safe
+        task.worker = None
+        task.partial_files.update(worker.partial_files)
+        if worker.completed:
+            # yt-dlp has renamed its .part files by now
+            task.partial_files.clear()
+            task.fetched = worker.downloads
+        self.persist(task)
+        if worker.completed and task.state != TaskState.CANCELLED:
+            # Fetched before a pause could land; nothing is left to pause
+            self.hand_off(task)
+            self.schedule()
+            return
+        self.fetching.discard(task)
+        if task.state == TaskState.CANCELLED:
+            self.remove_partial_files(task)
+        elif task.state == TaskState.WAITING:
+            self.enqueue(task, keep_seq=True) # resumed while it was stopping
+        elif task.state == TaskState.DOWNLOADING:
+            print(f"Download Error: {worker.error_message}")
+            task.error = worker.error_message
+            task.set_state(TaskState.FAILED)
+        self.schedule()
 
-    def on_error(self, worker, err):
-        print(f"Download Error: {err}")
-        if worker in self.active_tasks:
-            self.active_tasks.remove(worker)
+    def on_moving(self, task, path):
+        task.library_files.append(path)
+        self.persist(task)
+        self.flush()
 
+    def on_process_finished(self, task, worker):
+        self.processing.discard(task)
+        task.worker = None
+        if task.state == TaskState.CANCELLED:
+            # The worker may have finished before it saw the abort; a cancel
+            # still leaves nothing behind, in the library or in staging
+            if worker.completed:
+                task.partial_files.update(task.library_files)
+            self.remove_partial_files(task)
+        elif worker.completed:
+            task.fetched = []
+            shutil.rmtree(self.staging_dir(task), ignore_errors=True)
+            task.set_state(TaskState.COMPLETED)
+            self.task_finished.emit(task.title)
+        else:
+            print(f"Post-processing Error: {worker.error_message}")
+            task.error = worker.error_message
+            task.set_state(TaskState.FAILED)
+        self.schedule()
@@ -0,0 +1,107 @@
+from itertools import count
+from PySide6.QtCore import QObject, Signal
+
+class TaskState:
+    WAITING = 'waiting'
+    DOWNLOADING = 'downloading'
+    PROCESSING = 'processing'
+    PAUSED = 'paused'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+class DownloadTask(QObject):
+    # One queued download, owned by DownloadManager. The worker thread only
+    # exists while the task is fetching or post-processing.
+    progress = Signal(str)
+    state_changed = Signal(str)
+    files_changed = Signal()
+    _ids = count(1)
+
+    def __init__(self, url, title, priority=0, audio_format='mp3', task_id=None):
+        super().__init__()
+        self.id = next(self._ids) if task_id is None else task_id
+        self.url = url
+        self.title = title
+        self.priority = priority
+        self.audio_format = audio_format
+        self.state = TaskState.WAITING
+        self.seq = 0 # queue position, breaks priority ties FIFO
+        self.entry = None # the task's live entry in the waiting heap
+        self.worker = None
+        self.error = None
+        self.partial_files = set() # .part files yt-dlp has written so far
+        self.fetched = [] # info dicts of fetched files, waiting to be post-processed
+        self.library_files = [] # where post-processing put (or is putting) them
+        self.percent = 0.0 # of the fetch stage
+        self.group = None
+
+    @classmethod
+    def continue_ids(cls, last_id):
+        # After restoring persisted tasks, so new ones don't reuse their ids
+        cls._ids = count(last_id + 1)
+
+    def fetched_files(self):
+        paths = []
+        for info in self.fetched:
+            paths.append(info.get('filepath'))
+            paths.extend(t.get('filepath') for t in info.get('thumbnails') or [])
+        return [path for path in paths if path]
+
+    def add_partial_file(self, path):
+        self.partial_files.add(path)
+        self.files_changed.emit()
+
+    def set_state(self, state):
+        self.state = state
+        self.state_changed.emit(state)
+
+    def set_progress(self, progress_str):
+        # Fetch progress looks like "45.3%" or "[2/10] 45.3%"; post-processing
+        # reports the postprocessor name instead
+        if self.state == TaskState.DOWNLOADING:
+            try:
+                self.percent = float(progress_str.split(']')[-1].strip().replace('%', ''))
+            except ValueError:
+                pass
+        self.progress.emit(progress_str)
+
+class DownloadGroup(QObject):
+    # A playlist fanned out into one task per entry. The tasks are scheduled
+    # like any other; the group only aggregates them for display and retry.
+    changed = Signal()
+    _ids = count(1)
+
+    def __init__(self, url, title, group_id=None):
+        super().__init__()
+        self.id = next(self._ids) if group_id is None else group_id
+        self.url = url
+        self.title = title
+        self.tasks = []
+
+    @classmethod
+    def continue_ids(cls, last_id):
+        cls._ids = count(last_id + 1)
+
+    def add(self, task):
+        task.group = self
+        self.tasks.append(task)
+        task.state_changed.connect(self.changed)
+        task.progress.connect(self.changed)
+
+    def count(self, *states):
+        return sum(1 for task in self.tasks if task.state in states)
+
+    def percent(self):
+        # Fetched bytes stand in for overall progress
+        if not self.tasks:
+            return 0.0
+        done = 0.0
+        for task in self.tasks:
+            if task.state in (TaskState.PROCESSING, TaskState.COMPLETED):
+                done += 100
+            elif task.state != TaskState.CANCELLED:
+                # A paused or failed task that is queued again keeps its last
+                # fetch percent until the fetch reports again
+                done += task.percent
+        return done / len(self.tasks)
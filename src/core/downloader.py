@@ -1,3 +1,7 @@
+import os
+import shutil
+import tempfile
+from itertools import count
 import yt_dlp
 from PySide6.QtCore import QThread, Signal
 
@@ -24,13 +28,19 @@ class SearchWorker(QThread):
                     
                     results = []
                     if 'entries' in info:
+                        # Flat entries are enough to queue each track on its own
+                        entries = [
+                            {'url': entry.get('url') or entry.get('webpage_url'), 'title': entry.get('title')}
+                            for entry in info['entries'] if entry
+                        ]
                         playlist_data = {
                             'title': info.get('title', 'Unknown Playlist'),
                             'uploader': info.get('uploader', 'Unknown Uploader'),
                             'webpage_url': info.get('webpage_url', self.query),
                             'thumbnails': info.get('thumbnails', []),
                             'is_playlist': True,
-                            'video_count': len(list(info['entries']))
+                            'video_count': len(entries),
+                            'entries': [entry for entry in entries if entry['url']],
                         }
                         results.append(playlist_data)
                     else:
@@ -46,18 +56,61 @@ class SearchWorker(QThread):
         except Exception as e:
             self.error.emit(str(e))
 
+# Run in the post-processing stage, not by the download itself. "mp3"
+# re-encodes; "native" copies the source stream into its usual container
+# (Opus -> .opus, AAC -> .m4a), so ffmpeg only remuxes. The cover goes in
+# last, as yt-dlp itself orders it: FFmpegMetadata's remux drops or chokes
+# on an attached picture in M4A and Ogg.
+POSTPROCESSORS = {
+    'mp3': [
+        {'key': 'FFmpegExtractAudio','preferredcodec': 'mp3','preferredquality': '192'},
+        {'key': 'FFmpegMetadata'},
+        {'key': 'EmbedThumbnail'},
+    ],
+    'native': [
+        {'key': 'FFmpegExtractAudio','preferredcodec': 'best'},
+        {'key': 'FFmpegMetadata'},
+        {'key': 'EmbedThumbnail'},
+    ],
+}
+
+def downloaded_entries(info):
+    # The per-file info dicts yt-dlp filled in, flattening playlists
+    if info is None:
+        return
+    if 'entries' in info:
+        for entry in info['entries']:
+            yield from downloaded_entries(entry)
+    else:
+        yield from info.get('requested_downloads') or []
+
 class DownloadWorker(QThread):
-    progress = Signal(str) 
-    finished = Signal(str) 
-    error = Signal(str)
+    # Fetch stage: only moves bytes. DownloadManager reads the outcome once
+    # the thread finishes and hands `downloads` to a PostProcessWorker.
+    progress = Signal(str)
+    partial_file = Signal(str) # each .part file, as soon as yt-dlp starts it
 
     def __init__(self, url, save_path):
         super().__init__()
         self.url = url
         self.save_path = save_path
+        self.aborted = False
+        self.completed = False
+        self.error_message = None
+        self.partial_files = set()
+        self.downloads = []
+
+    def abort(self):
+        # Takes effect at the next progress callback
+        self.aborted = True
 
     def run(self):
         def progress_hook(d):
+            if self.aborted:
+                raise yt_dlp.utils.DownloadCancelled()
+            if d.get('tmpfilename') and d['tmpfilename'] not in self.partial_files:
+                self.partial_files.add(d['tmpfilename'])
+                self.partial_file.emit(d['tmpfilename'])
             if d['status'] == 'downloading':
                 if 'playlist_count' in d and d['playlist_count'] is not None:
                     index = d.get('playlist_index', 1)
@@ -72,19 +125,95 @@ class DownloadWorker(QThread):
             'format': 'bestaudio/best',
             'outtmpl': f'{self.save_path}/%(title)s.%(ext)s',
             'writethumbnail': True,
-            'postprocessors': [
-                {'key': 'FFmpegExtractAudio','preferredcodec': 'mp3','preferredquality': '192'},
-                {'key': 'EmbedThumbnail'},
-                {'key': 'FFmpegMetadata'},
-            ],
+            'continuedl': True, # resume .part files left by a pause or a previous run
             'progress_hooks': [progress_hook],
             'quiet': True,
         }
         
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.extract_info(self.url, download=True)
-                self.finished.emit("Download Complete")
+                info = ydl.extract_info(self.url, download=True)
+            self.downloads = list(downloaded_entries(info))
+            self.completed = not self.aborted
         except Exception as e:
-            self.error.emit(str(e))
+            if not self.aborted:
+                self.error_message = str(e)
+
+class PostProcessWorker(QThread):
+    # CPU stage: transcode, embed the cover and tag what a DownloadWorker
+    # fetched into the staging folder, then move the result into the library
+    progress = Signal(str)
+    moving = Signal(str) # library path, just before a file appears there
+
+    def __init__(self, downloads, audio_format='mp3', library_dir=None):
+        super().__init__()
+        self.downloads = downloads
+        self.audio_format = audio_format
+        self.library_dir = library_dir
+        self.aborted = False
+        self.completed = False
+        self.error_message = None
+
+    def abort(self):
+        # Takes effect before the next postprocessor starts
+        self.aborted = True
+
+    def run(self):
+        total = len(self.downloads)
+        index = 0
 
+        def postprocessor_hook(d):
+            if self.aborted:
+                raise yt_dlp.utils.DownloadCancelled()
+            if d['status'] == 'started':
+                name = d.get('postprocessor', '')
+                self.progress.emit(f"[{index}/{total}] {name}" if total > 1 else name)
+
+        ydl_opts = {
+            'postprocessors': POSTPROCESSORS[self.audio_format],
+            'postprocessor_hooks': [postprocessor_hook],
+            'quiet': True,
+        }
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                for info in self.downloads:
+                    index += 1
+                    # Updates info['filepath'] in place as files are replaced
+                    ydl.post_process(info['filepath'], info)
+                    if self.library_dir:
+                        info['filepath'] = self.move_to_library(info['filepath'])
+            self.completed = not self.aborted
+        except Exception as e:
+            if not self.aborted:
+                self.error_message = str(e)
+
+    def move_to_library(self, path):
+        # Staging may be on another filesystem, so the copy goes to a name the
+        # scanner ignores and only the final link shows up in the library. An
+        # existing song is never replaced: the newcomer becomes "Title (2)".
+        name, ext = os.path.splitext(os.path.basename(path))
+        fd, partial = tempfile.mkstemp(suffix=f'.part{ext}', prefix=f'{name}.', dir=self.library_dir)
+        os.close(fd)
+        try:
+            shutil.move(path, partial)
+            for n in count(1):
+                target = os.path.join(self.library_dir, f"{name}{ext}" if n == 1 else f"{name} ({n}){ext}")
+                if os.path.exists(target):
+                    continue
+                self.moving.emit(target)
+                try:
+                    # Unlike a rename, linking fails if the name is taken,
+                    # even when another task claims it at the same moment
+                    os.link(partial, target)
+                except FileExistsError:
+                    continue
+                except OSError:
+                    # No hard links here (FAT, some network shares)
+                    if os.path.exists(target):
+                        continue
+                    os.replace(partial, target)
+                return target
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
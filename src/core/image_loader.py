@@ -0,0 +1,158 @@
+from functools import partial
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from src.utils.config import Config
+from src.core.pixmap_cache import PixmapCache
+from src.core.thumbnails import ThumbnailService
+from src.database.db_manager import DBManager
+
+class ImageDecodeTask(QRunnable):
+    def __init__(self, loader, key, source):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.key = key
+        self.source = source
+
+    def run(self):
+        # QImage (unlike QPixmap) may be created off the GUI thread
+        size = self.key[1]
+        reader = QImageReader(self.source)
+        reader.setAutoTransform(True)
+        image = reader.read()
+        if size and not image.isNull() and (image.width() > size or image.height() > size):
+            image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.loader.decoded.emit(self.key, image)
+
+class ImageLoader(QObject):
+    # Decodes images on a worker pool and delivers QPixmaps on the GUI thread.
+    # Each owner widget has at most one pending load: asking again replaces
+    # it, and destroying the widget cancels it. Requests for the same
+    # (path, size) share a single decode.
+    decoded = Signal(object, QImage)
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(Config.IMAGE_LOADER_THREADS)
+        self.cache = PixmapCache.instance()
+        self.tasks = {}    # key -> ImageDecodeTask
+        self.waiters = {}  # key -> {owner_id: callback}
+        self.pending = {}  # owner_id -> {key}
+        self.owners = set()
+        # Keys whose image is missing or undecodable. Without this a view
+        # repainting on the (null) result would queue the decode again forever.
+        self.failed = set()
+        self.decoded.connect(self.on_decoded)
+        ThumbnailService.instance().thumbnail_ready.connect(self.forget_failed)
+
+        # Covers shown since the last flush; written out in one batch
+        self.shown = set()
+        self.touch_timer = QTimer(self)
+        self.touch_timer.setSingleShot(True)
+        self.touch_timer.setInterval(Config.COVER_TOUCH_INTERVAL_MS)
+        self.touch_timer.timeout.connect(self.flush_shown)
+
+    def load_cover(self, owner, cover_path, size, callback):
+        # Cover art is read from the thumbnail of the requested size class
+        source = ThumbnailService.instance().path_for(cover_path, size) if cover_path else None
+        self.mark_shown(cover_path)
+        self.request(owner, (cover_path, size), source, callback)
+
+    def load(self, owner, path, size, callback):
+        self.request(owner, (path, size), path, callback)
+
+    def fetch_cover(self, owner, cover_path, size, callback):
+        # For views painting many rows: returns the cached pixmap, or None after
+        # queueing a decode. Unlike load_cover, earlier requests are kept.
+        key = (cover_path, size)
+        if not cover_path or key in self.failed:
+            return None
+        self.mark_shown(cover_path)
+        pixmap = self.cache.find(key)
+        if pixmap is None:
+            self.enqueue(owner, key, ThumbnailService.instance().path_for(cover_path, size), callback)
+        return pixmap
+
+    def mark_shown(self, cover_path):
+        if cover_path:
+            self.shown.add(cover_path)
+            if not self.touch_timer.isActive():
+                self.touch_timer.start()
+
+    def flush_shown(self):
+        shown, self.shown = self.shown, set()
+        if shown:
+            DBManager().touch_covers(shown)
+
+    def request(self, owner, key, source, callback):
+        self.cancel(owner)
+        if not key[0]:
+            return
+        if key in self.failed:
+            callback(QPixmap())
+            return
+        pixmap = self.cache.find(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return
+        self.enqueue(owner, key, source, callback)
+
+    def forget_failed(self, cover_path):
+        # A new thumbnail was written for this cover; decoding may work now
+        self.failed = {key for key in self.failed if key[0] != cover_path}
+
+    def enqueue(self, owner, key, source, callback):
+        owner_id = id(owner)
+        if owner_id not in self.owners:
+            self.owners.add(owner_id)
+            owner.destroyed.connect(partial(self.on_owner_destroyed, owner_id))
+        self.pending.setdefault(owner_id, set()).add(key)
+        self.waiters.setdefault(key, {})[owner_id] = callback
+        if key not in self.tasks:
+            task = ImageDecodeTask(self, key, source)
+            self.tasks[key] = task
+            self.pool.start(task)
+
+    def cancel(self, owner):
+        self.cancel_id(id(owner))
+
+    def on_owner_destroyed(self, owner_id, *_):
+        self.owners.discard(owner_id)
+        self.cancel_id(owner_id)
+
+    def cancel_id(self, owner_id):
+        for key in self.pending.pop(owner_id, ()):
+            waiters = self.waiters.get(key)
+            if waiters is None:
+                continue
+            waiters.pop(owner_id, None)
+            if not waiters:
+                del self.waiters[key]
+                # Drop the decode too if no worker has picked it up yet
+                task = self.tasks.get(key)
+                if task is not None and self.pool.tryTake(task):
+                    del self.tasks[key]
+
+    def on_decoded(self, key, image):
+        self.tasks.pop(key, None)
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.isNull():
+            self.failed.add(key)
+        else:
+            self.cache.insert(key, pixmap)
+        for owner_id, callback in self.waiters.pop(key, {}).items():
+            keys = self.pending.get(owner_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.pending[owner_id]
+            callback(pixmap)
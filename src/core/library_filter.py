@@ -0,0 +1,128 @@
+import re
+import unicodedata
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from src.utils.config import Config
+
+class LibraryFilter(QObject):
+    # Debounced search over the library. A query that only refines the last
+    # one ("bea" -> "beat", "beat" -> "beat it") narrows the previous results
+    # in memory; anything else goes to the FTS index. Big jobs run on a worker
+    # thread and results from superseded queries are dropped.
+    results_ready = Signal(list)
+    job_finished = Signal(int, object, object) # generation, terms, future
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rebbit-filter")
+        self.query = ''
+        self.generation = 0
+        self.future = None
+        self.last_terms = None
+        self.last_results = None
+        self.keys = {} # song id -> " word word ..." of title/artist/album
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(Config.FILTER_DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.run)
+        self.job_finished.connect(self.on_job_finished)
+
+    @staticmethod
+    def tokenize(text):
+        # Same folding as the FTS tokenizer (unicode61, remove_diacritics)
+        text = text.casefold()
+        if not text.isascii():
+            text = unicodedata.normalize('NFKD', text)
+            text = ''.join(c for c in text if not unicodedata.combining(c))
+        return tuple(re.findall(r'\w+', text))
+
+    @staticmethod
+    def is_refinement(old_terms, new_terms):
+        # Every old term is a prefix of some new term, so anything matching the
+        # new query also matched the old one
+        return all(any(new.startswith(old) for new in new_terms) for old in old_terms)
+
+    def search_key(self, song):
+        # A term is a word prefix iff " term" occurs in " word word ...", which
+        # turns matching into plain substring tests
+        key = self.keys.get(song.id)
+        if key is None:
+            words = self.tokenize(f"{song.title or ''} {song.artist or ''} {song.album or ''}")
+            key = ' ' + ' '.join(words)
+            self.keys[song.id] = key
+        return key
+
+    def set_query(self, text):
+        self.query = text
+        self.debounce.start()
+
+    def refresh(self):
+        # The library changed under the current results: go back to the index
+        self.last_terms = None
+        self.last_results = None
+        self.run()
+
+    def invalidate(self, song_ids):
+        for song_id in song_ids:
+            self.keys.pop(song_id, None)
+
+    def cancel(self):
+        self.debounce.stop()
+        self.generation += 1
+        if self.future:
+            self.future.cancel()
+            self.future = None
+        self.last_terms = None
+        self.last_results = None
+
+    def run(self):
+        self.debounce.stop()
+        self.generation += 1
+        if self.future:
+            self.future.cancel()
+        terms = self.tokenize(self.query)
+        if not terms:
+            self.finish(terms, [])
+            return
+
+        generation = self.generation
+        if self.last_terms is not None and self.is_refinement(self.last_terms, terms):
+            if len(self.last_results) < Config.FILTER_THREAD_MIN:
+                self.finish(terms, self.narrow(self.last_results, terms, generation))
+                return
+            job = partial(self.narrow, self.last_results, terms, generation)
+        else:
+            job = partial(self.db.search_songs, self.query)
+        self.future = self.executor.submit(job)
+        self.future.add_done_callback(lambda f: self.job_finished.emit(generation, terms, f))
+
+    def narrow(self, songs, terms, generation):
+        needles = [' ' + term for term in terms]
+        results = []
+        for i, song in enumerate(songs):
+            if i % 1000 == 0 and generation != self.generation:
+                return None
+            key = self.search_key(song)
+            if all(needle in key for needle in needles):
+                results.append(song)
+        return results
+
+    def on_job_finished(self, generation, terms, future):
+        if generation != self.generation or future.cancelled():
+            return
+        self.future = None
+        if future.exception():
+            print(f"Filter Error: {future.exception()}")
+            return
+        results = future.result()
+        if results is not None:
+            self.finish(terms, results)
+
+    def finish(self, terms, results):
+        self.last_terms = terms
+        self.last_results = results
+        self.results_ready.emit(results)
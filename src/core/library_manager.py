@@ -1,39 +1,280 @@
 import os
-from PySide6.QtCore import QObject, Signal, QThread
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor, wait, FIRST_COMPLETED
+from PySide6.QtCore import QObject, Signal, QThread, QTimer
 
 from src.utils.config import Config
 from src.database.db_manager import DBManager
+from src.database.connection import ConnectionManager
 from src.core.metadata import MetadataExtractor
+from src.core.cover_cache import CoverCache
+from src.core.library_watcher import LibraryWatcher
+from src.core.song import SongRegistry
 
 class LibraryScanner(QThread):
-    scan_finished = Signal()
-    
+    scan_finished = Signal(list, list, list) # added, updated, removed song ids
+
+    def __init__(self):
+        super().__init__()
+        self.directories = None # None scans the whole music root
+
     def run(self):
         db = DBManager()
-        music_dir = Config.DEFAULT_MUSIC_DIR
-        for root, dirs, files in os.walk(music_dir):
-            for file in files:
-                if file.lower().endswith('.mp3'):
-                    full_path = os.path.join(root, file)
-                    if not db.song_exists(full_path):
-                        meta = MetadataExtractor.extract(full_path)
-                        db.add_song(meta)
-        self.scan_finished.emit()
+        if self.directories is None:
+            known = db.get_fingerprints()
+            files = self.iter_audio_files(Config.DEFAULT_MUSIC_DIR)
+        else:
+            known, files = self.collect_directories(db, self.directories)
+
+        new_files = {}
+        changed = []
+        seen = set()
+        for path, fingerprint in files:
+            seen.add(path)
+            row = known.get(path)
+            if row is None:
+                new_files[path] = fingerprint
+            elif row[1:] != fingerprint:
+                changed.append((row[0], path, fingerprint))
+
+        vanished = {path: row for path, row in known.items() if path not in seen}
+
+        # A vanished row whose (size, mtime, inode) reappears under a new path
+        # was renamed or moved; keep its id (and playlist membership)
+        by_fingerprint = {row[1:]: (path, row[0]) for path, row in vanished.items() if row[3]}
+        moves = []
+        for path, fingerprint in list(new_files.items()):
+            match = by_fingerprint.pop(fingerprint, None)
+            if match:
+                old_path, song_id = match
+                del vanished[old_path]
+                del new_files[path]
+                moves.append((song_id, path, *fingerprint))
+
+        db.remove_songs(row[0] for row in vanished.values())
+        db.move_songs(moves)
+
+        # Results arrive in completion order; the single DB writer flushes
+        # them in batches regardless of which worker produced them
+        to_add, to_update = [], []
+        jobs = [(path, fingerprint, None) for path, fingerprint in new_files.items()]
+        jobs += [(path, fingerprint, song_id) for song_id, path, fingerprint in changed]
+        for meta, song_id in self.extract_all(jobs):
+            if song_id is None:
+                to_add.append(meta)
+            else:
+                meta['id'] = song_id
+                to_update.append(meta)
+            if len(to_add) >= Config.DB_BATCH_SIZE:
+                db.add_songs(to_add)
+                to_add = []
+            if len(to_update) >= Config.DB_BATCH_SIZE:
+                db.update_songs(to_update)
+                to_update = []
+        db.add_songs(to_add)
+        db.update_songs(to_update)
+
+        added_ids = db.get_ids_by_paths(new_files)
+        updated_ids = [song_id for song_id, _, _ in changed] + [move[0] for move in moves]
+        removed_ids = [row[0] for row in vanished.values()]
+        if removed_ids or updated_ids:
+            CoverCache.collect_garbage(db)
+        ConnectionManager.close()
+        self.scan_finished.emit(added_ids, updated_ids, removed_ids)
+
+    def collect_directories(self, db, directories):
+        # Only the given folders are listed (non-recursively). Rows under a
+        # subfolder are included too if that subfolder no longer exists, so
+        # deleting a whole folder prunes its songs.
+        known = {}
+        files = []
+        for directory in directories:
+            for path, row in db.get_fingerprints(directory).items():
+                parent = os.path.dirname(path)
+                if parent == directory or not os.path.isdir(parent):
+                    known[path] = row
+            files.extend(self.iter_audio_files(directory, recursive=False))
+        return known, files
+
+    def extract_all(self, jobs):
+        if Config.SCAN_WORKERS <= 1 or len(jobs) < 2:
+            for path, fingerprint, song_id in jobs:
+                yield self.with_fingerprint(MetadataExtractor.extract(path), fingerprint), song_id
+            return
+
+        pending = deque(jobs)
+        suspects = deque()
+        crashed = set()
+        executor = self.create_executor()
+        in_flight = {}
+        try:
+            while pending or suspects or in_flight:
+                if suspects:
+                    # Jobs caught in a worker crash are retried one at a time
+                    if not in_flight:
+                        job = suspects.popleft()
+                        in_flight[executor.submit(MetadataExtractor.extract, job[0])] = job
+                else:
+                    # Keep a bounded window in flight so memory doesn't scale with the backlog
+                    while pending and len(in_flight) < Config.SCAN_WORKERS * 4:
+                        job = pending.popleft()
+                        in_flight[executor.submit(MetadataExtractor.extract, job[0])] = job
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                if any(isinstance(f.exception(), BrokenExecutor) for f in done):
+                    # A worker process died (e.g. a crashing decoder) and took every
+                    # in-flight job with it; a job that crashes on its own is the culprit
+                    jobs_lost = list(in_flight.values())
+                    if len(jobs_lost) == 1 and jobs_lost[0] in crashed:
+                        path, fingerprint, song_id = jobs_lost[0]
+                        print(f"Skipping metadata for {path}: scan worker crashed")
+                        yield self.with_fingerprint(MetadataExtractor.defaults(path), fingerprint), song_id
+                    else:
+                        crashed.update(jobs_lost)
+                        suspects.extend(jobs_lost)
+                    in_flight.clear()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = self.create_executor()
+                    continue
+                for future in done:
+                    path, fingerprint, song_id = in_flight.pop(future)
+                    try:
+                        meta = future.result()
+                    except Exception as e:
+                        print(f"Error reading metadata for {path}: {e}")
+                        meta = MetadataExtractor.defaults(path)
+                    yield self.with_fingerprint(meta, fingerprint), song_id
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def create_executor(self):
+        if Config.SCAN_EXECUTOR == "process":
+            return ProcessPoolExecutor(max_workers=Config.SCAN_WORKERS)
+        return ThreadPoolExecutor(max_workers=Config.SCAN_WORKERS, thread_name_prefix="rebbit-scan")
+
+    def with_fingerprint(self, meta, fingerprint):
+        meta['size'], meta['mtime'], meta['inode'] = fingerprint
+        return meta
+
+    def iter_audio_files(self, root, recursive=True):
+        # os.scandir hands back the stat from the directory listing, so a
+        # no-change rescan costs one readdir per folder and no per-file DB work
+        stack = [str(root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif self.is_audio_file(entry.name):
+                            st = entry.stat()
+                            yield entry.path, (st.st_size, st.st_mtime_ns, st.st_ino)
+                    except OSError:
+                        continue
+
+    @staticmethod
+    def is_audio_file(name):
+        name = name.lower()
+        if not name.endswith(Config.AUDIO_EXTENSIONS) or name.startswith('.'):
+            return False
+        # yt-dlp / ffmpeg intermediates such as "Song.temp.mp3"
+        stem = os.path.splitext(name)[0]
+        return not stem.endswith(('.temp', '.part'))
 
 class LibraryManager(QObject):
-    library_changed = Signal(list)
+    library_reset = Signal()
+    library_page = Signal(list)
+    library_loaded = Signal()
+    songs_added = Signal(list)
+    songs_updated = Signal(list)
+    songs_removed = Signal(list) # song ids
+    scan_report = Signal(int, int, int)
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
 
     def __init__(self):
         super().__init__()
         self.db = DBManager()
+        self.pages = None
+        self.queued_full_scan = False
+        self.queued_directories = set()
         self.scanner = LibraryScanner()
-        self.scanner.scan_finished.connect(self.load_library)
+        self.scanner.scan_finished.connect(self.on_scan_finished)
+        self.watcher = LibraryWatcher(Config.DEFAULT_MUSIC_DIR)
+        self.watcher.directories_changed.connect(self.scan_directories)
 
     def refresh_library(self):
-        if not self.scanner.isRunning():
-            self.scanner.start()
+        self.request_scan(None)
+
+    def scan_directories(self, directories):
+        self.request_scan(set(directories))
+
+    def request_scan(self, directories):
+        if self.scanner.isRunning():
+            if directories is None:
+                self.queued_full_scan = True
+            else:
+                self.queued_directories.update(directories)
+            return
+        self.scanner.directories = directories
+        self.scanner.start()
+
+    def update_song_metadata(self, song_id, title, artist, album, cover_path, filepath=None):
+        # Tag-only edits don't touch the folder, so the watcher never sees
+        # them; emit the same update delta a rescan would
+        if not self.db.update_song_metadata(song_id, title, artist, album, cover_path, filepath):
+            return False
+        if self.pages is not None:
+            self.load_library()
+        else:
+            self.songs_updated.emit(self.db.get_songs_by_ids([song_id]))
+        return True
+
+    def on_scan_finished(self, added, updated, removed):
+        self.scan_report.emit(len(added), len(updated), len(removed))
+        SongRegistry.instance().forget(removed)
+        if self.pages is not None:
+            # Pages already sent may predate this scan; resend rather than patch
+            if added or updated or removed:
+                self.load_library()
+        elif removed:
+            self.songs_removed.emit(removed)
+        if updated and self.pages is None:
+            self.songs_updated.emit(self.db.get_songs_by_ids(updated))
+        if added and self.pages is None:
+            self.songs_added.emit(self.db.get_songs_by_ids(added))
+
+        if self.queued_full_scan:
+            self.queued_full_scan = False
+            self.queued_directories.clear()
+            self.request_scan(None)
+        elif self.queued_directories:
+            directories, self.queued_directories = self.queued_directories, set()
+            self.request_scan(directories)
 
     def load_library(self):
-        songs = self.db.get_all_songs()
-        self.library_changed.emit(songs)
+        # First page goes out synchronously; the rest trickle out between event
+        # loop iterations so a huge library never blocks the UI in one go
+        self.pages = self.db.iter_songs('title')
+        self.library_reset.emit()
+        self.emit_next_page(self.pages)
 
+    def emit_next_page(self, pages):
+        if pages is not self.pages:
+            return
+        page = next(pages, None)
+        if page is None:
+            self.pages = None
+            self.library_loaded.emit()
+            return
+        self.library_page.emit(page)
+        QTimer.singleShot(0, lambda: self.emit_next_page(pages))
@@ -0,0 +1,191 @@
+import locale
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, Signal
+
+class SortedSongs(Sequence):
+    # The rows of one order, read straight from its id array. A list model
+    # backed by this never copies the library, and switching order swaps
+    # one view for another.
+    def __init__(self, library_sort, name):
+        self.library_sort = library_sort
+        self.name = name
+        self.descending = library_sort.ORDERS[name][1]
+
+    def __len__(self):
+        return len(self.library_sort.index(self.name))
+
+    def __getitem__(self, row):
+        ids = self.library_sort.index(self.name)
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(ids)))]
+        if row < 0:
+            row += len(ids)
+        if not 0 <= row < len(ids):
+            raise IndexError(row)
+        return self.library_sort.songs[ids[len(ids) - 1 - row if self.descending else row]]
+
+    def __iter__(self):
+        ids = self.library_sort.index(self.name)
+        songs = self.library_sort.songs
+        return (songs[song_id] for song_id in (reversed(ids) if self.descending else ids))
+
+    def row_of(self, song_id):
+        if song_id not in self.library_sort.songs:
+            return None
+        return self.library_sort.display_row(self.name, self.library_sort.position(self.name, song_id))
+
+class LibrarySort(QObject):
+    # One sorted array of song ids per sort order, built from collation keys
+    # computed once per song. Once the library has loaded, the orders not in
+    # use are sorted on a worker thread; after that every add/remove/update
+    # keeps them current, so switching order is a lookup.
+    index_built = Signal(str, int, object) # name, generation, future
+    ORDERS = {
+        # name: (label, descending)
+        'title': ("Title", False),
+        'artist': ("Artist", False),
+        'album': ("Album", False),
+        'duration': ("Duration", False),
+        'date_added': ("Recently Added", True),
+    }
+
+    def __init__(self, order='title', parent=None):
+        super().__init__(parent)
+        self.order = order
+        self.songs = {}
+        self.keys = {name: {} for name in self.ORDERS}
+        self.indexes = {} # name -> array('q') of ids, ascending by key
+        self.generation = 0 # bumped whenever the song set changes
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rebbit-sort")
+        self.index_built.connect(self.on_index_built)
+
+    @staticmethod
+    def collate(text):
+        # Honours LC_COLLATE (set at startup) so accents sort next to their base letter
+        return locale.strxfrm((text or '').casefold())
+
+    def make_key(self, name, song):
+        title = self.collate(song.title)
+        if name == 'title':
+            return (title,)
+        if name == 'artist':
+            return (self.collate(song.artist), title)
+        if name == 'album':
+            return (self.collate(song.album), title)
+        if name == 'duration':
+            return (song.duration or 0, title)
+        return (song.date_added or '',)
+
+    def sort_key(self, name, song_id):
+        cache = self.keys[name]
+        key = cache.get(song_id)
+        if key is None:
+            # The id breaks ties so every key is unique and bisect is exact
+            key = self.make_key(name, self.songs[song_id]) + (song_id,)
+            cache[song_id] = key
+        return key
+
+    def load(self, songs):
+        self.generation += 1
+        self.songs = {}
+        self.keys = {name: {} for name in self.ORDERS}
+        self.extend(songs)
+
+    def extend(self, songs):
+        # Bulk loads drop the built orders; re-sorting once is cheaper than
+        # thousands of array inserts
+        self.generation += 1
+        for song in songs:
+            self.songs[song.id] = song
+        self.indexes = {}
+
+    def index(self, name=None):
+        name = name or self.order
+        ids = self.indexes.get(name)
+        if ids is None:
+            ids = array('q', sorted(self.songs, key=lambda song_id: self.sort_key(name, song_id)))
+            self.indexes[name] = ids
+        return ids
+
+    def prebuild(self):
+        # Songs are immutable, so a snapshot can be keyed and sorted off the
+        # GUI thread; a result is dropped if the library changed meanwhile
+        songs = list(self.songs.values())
+        generation = self.generation
+        for name in self.ORDERS:
+            if name not in self.indexes:
+                future = self.executor.submit(self.build, name, songs)
+                future.add_done_callback(lambda f, name=name: self.index_built.emit(name, generation, f))
+
+    def build(self, name, songs):
+        keys = {song.id: self.make_key(name, song) + (song.id,) for song in songs}
+        return array('q', sorted(keys, key=keys.__getitem__)), keys
+
+    def on_index_built(self, name, generation, future):
+        if generation != self.generation or name in self.indexes:
+            return
+        if future.exception():
+            print(f"Sort Error: {future.exception()}")
+            return
+        self.indexes[name], self.keys[name] = future.result()
+
+    def set_order(self, name):
+        self.order = name
+        self.index(name)
+
+    def view(self, name=None):
+        return SortedSongs(self, name or self.order)
+
+    def position(self, name, song_id):
+        ids = self.index(name)
+        return bisect_left(ids, self.sort_key(name, song_id), key=lambda i: self.sort_key(name, i))
+
+    def display_row(self, name, position):
+        if self.ORDERS[name][1]:
+            return len(self.indexes[name]) - 1 - position
+        return position
+
+    def row_of(self, song_id):
+        # Row of a song in the current order
+        return self.view().row_of(song_id)
+
+    def insertion_row(self, song):
+        # Row add(song) will put the song on, without adding it
+        ids = self.index()
+        key = self.make_key(self.order, song) + (song.id,)
+        position = bisect_left(ids, key, key=lambda i: self.sort_key(self.order, i))
+        return len(ids) - position if self.ORDERS[self.order][1] else position
+
+    def add(self, song):
+        # Returns the row the song lands on in the current order
+        self.index()
+        self.generation += 1
+        song_id = song.id
+        self.songs[song_id] = song
+        for name, ids in self.indexes.items():
+            ids.insert(self.position(name, song_id), song_id)
+        return self.display_row(self.order, self.position(self.order, song_id))
+
+    def remove(self, song_id):
+        # Returns the row the song occupied in the current order
+        if song_id not in self.songs:
+            return None
+        self.index()
+        self.generation += 1
+        row = self.row_of(song_id)
+        for name, ids in self.indexes.items():
+            del ids[self.position(name, song_id)]
+        for cache in self.keys.values():
+            cache.pop(song_id, None)
+        del self.songs[song_id]
+        return row
+
+    def update(self, song):
+        self.remove(song.id)
+        return self.add(song)
+
+    def __len__(self):
+        return len(self.songs)
@@ -0,0 +1,63 @@
+import os
+from PySide6.QtCore import QObject, Signal, QTimer, QFileSystemWatcher
+
+from src.utils.config import Config
+
+class LibraryWatcher(QObject):
+    directories_changed = Signal(list)
+
+    def __init__(self, root):
+        super().__init__()
+        self.root = os.path.normpath(str(root))
+        self.dirty = set()
+
+        # QFileSystemWatcher is not recursive, so every folder under the root
+        # gets its own watch (one inotify watch / ReadDirectoryChangesW handle each)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
+        # yt-dlp writes .part/.temp files and renames them, so a single download
+        # fires a burst of events; coalesce them into one delta scan
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(Config.WATCH_DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.flush)
+
+        # os.walk yields nothing for a missing folder, which would leave the
+        # library unwatched until restart
+        try:
+            os.makedirs(self.root, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating music directory: {e}")
+        self.watch_tree(self.root)
+
+    def watch_tree(self, top):
+        directories = [top]
+        for root, dirs, _ in os.walk(top):
+            directories.extend(os.path.join(root, d) for d in dirs)
+        watched = set(self.watched_directories())
+        new = [d for d in directories if d not in watched]
+        if new:
+            self.watcher.addPaths(new)
+        return new
+
+    def watched_directories(self):
+        return [os.path.normpath(d) for d in self.watcher.directories()]
+
+    def on_directory_changed(self, path):
+        self.dirty.add(os.path.normpath(path))
+        self.debounce.start()
+
+    def flush(self):
+        dirty, self.dirty = self.dirty, set()
+        changed = set()
+        for directory in dirty:
+            changed.add(directory)
+            if os.path.isdir(directory):
+                # Folders created (or moved in) since the last event need their
+                # own watches and a scan of everything already inside them
+                changed.update(self.watch_tree(directory))
+            elif directory != self.root:
+                changed.add(os.path.dirname(directory))
+        if changed:
+            self.directories_changed.emit(sorted(changed))
@@ -1,14 +1,17 @@
 import os
-import hashlib
-from mutagen.mp3 import MP3
+import base64
+import mutagen
 from mutagen.id3 import ID3, APIC
+from mutagen.mp4 import MP4Tags, MP4Cover
+from mutagen.flac import Picture
 
-from src.utils.config import Config
+from src.core.cover_cache import CoverCache
+from src.core.thumbnails import ThumbnailService
 
 class MetadataExtractor:
     @staticmethod
-    def extract(filepath):
-        data = {
+    def defaults(filepath):
+        return {
             'filepath': filepath,
             'title': os.path.basename(filepath),
             'artist': 'Unknown Artist',
@@ -17,25 +20,68 @@ class MetadataExtractor:
             'cover_path': None
         }
 
+    @staticmethod
+    def extract(filepath):
+        data = MetadataExtractor.defaults(filepath)
+
         try:
-            audio = MP3(filepath, ID3=ID3)
+            audio = mutagen.File(filepath)
+            if audio is None:
+                raise ValueError("unsupported audio format")
             data['duration'] = int(audio.info.length)
-            if audio.tags:
-                if 'TIT2' in audio.tags: data['title'] = str(audio.tags['TIT2'])
-                if 'TPE1' in audio.tags: data['artist'] = str(audio.tags['TPE1'])
-                if 'TALB' in audio.tags: data['album'] = str(audio.tags['TALB'])
-                for tag in audio.tags.values():
-                    if isinstance(tag, APIC):
-                        hash_name = hashlib.md5(filepath.encode()).hexdigest()
-                        ext = 'png' if 'png' in tag.mime else 'jpg'
-                        image_filename = f"{hash_name}.{ext}"
-                        save_path = Config.BASE_DIR / "assets" / "cache" / image_filename
-                        if not save_path.exists():
-                            with open(save_path, 'wb') as img:
-                                img.write(tag.data)
-                        data['cover_path'] = str(save_path)
-                        break
+            if isinstance(audio.tags, ID3):
+                cover = MetadataExtractor.read_id3(audio.tags, data)
+            elif isinstance(audio.tags, MP4Tags):
+                cover = MetadataExtractor.read_mp4(audio.tags, data)
+            elif audio.tags is not None:
+                cover = MetadataExtractor.read_vorbis(audio, data)
+            else:
+                cover = None
+            if cover:
+                data['cover_path'] = CoverCache.store(*cover)
+                # Scans already run off the GUI thread, so build the
+                # thumbnails here rather than on first display
+                ThumbnailService.generate(data['cover_path'])
         except Exception as e:
             print(f"Error reading metadata for {filepath}: {e}")
         return data
 
+    # Each reader fills title/artist/album into `data` and returns the
+    # embedded cover as (bytes, mime), or None
+
+    @staticmethod
+    def read_id3(tags, data):
+        # MP3
+        if 'TIT2' in tags: data['title'] = str(tags['TIT2'])
+        if 'TPE1' in tags: data['artist'] = str(tags['TPE1'])
+        if 'TALB' in tags: data['album'] = str(tags['TALB'])
+        for tag in tags.values():
+            if isinstance(tag, APIC):
+                return tag.data, tag.mime
+        return None
+
+    @staticmethod
+    def read_mp4(tags, data):
+        # M4A
+        if tags.get('\xa9nam'): data['title'] = str(tags['\xa9nam'][0])
+        if tags.get('\xa9ART'): data['artist'] = str(tags['\xa9ART'][0])
+        if tags.get('\xa9alb'): data['album'] = str(tags['\xa9alb'][0])
+        if tags.get('covr'):
+            cover = tags['covr'][0]
+            return bytes(cover), 'image/png' if cover.imageformat == MP4Cover.FORMAT_PNG else 'image/jpeg'
+        return None
+
+    @staticmethod
+    def read_vorbis(audio, data):
+        # Opus, Ogg Vorbis and FLAC. FLAC keeps pictures in their own blocks;
+        # Ogg files carry them base64-encoded in a comment.
+        tags = audio.tags
+        if tags.get('title'): data['title'] = tags['title'][0]
+        if tags.get('artist'): data['artist'] = tags['artist'][0]
+        if tags.get('album'): data['album'] = tags['album'][0]
+        pictures = getattr(audio, 'pictures', None)
+        if not pictures and tags.get('metadata_block_picture'):
+            pictures = [Picture(base64.b64decode(tags['metadata_block_picture'][0]))]
+        if pictures:
+            return pictures[0].data, pictures[0].mime
+        return None
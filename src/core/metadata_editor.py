@@ -1,7 +1,10 @@
 import os
+import base64
 import mimetypes
-from mutagen.mp3 import MP3
+import mutagen
+from mutagen.flac import FLAC, Picture
 from mutagen.id3 import ID3, APIC, TIT2, TPE1, TALB
+from mutagen.mp4 import MP4Tags, MP4Cover
 
 from src.utils.config import Config
 
@@ -10,40 +13,86 @@ class MetadataEditor:
         self.filepath = filepath
         self.audio = None
         try:
-            self.audio = MP3(filepath, ID3=ID3)
-        except Exception:
-            try:
-                self.audio = MP3(filepath)
+            self.audio = mutagen.File(filepath)
+            if self.audio is None:
+                print("Error opening file for editing: unsupported audio format")
+            elif self.audio.tags is None:
                 self.audio.add_tags()
-            except Exception as e:
-                print(f"Error opening file for editing: {e}")
+        except Exception as e:
+            self.audio = None
+            print(f"Error opening file for editing: {e}")
 
     def save(self, title, artist, album, cover_path=None):
-        if not self.audio:
+        if self.audio is None:
             return False
         try:
-            if title:
-                self.audio.tags.add(TIT2(encoding=3, text=title))
-            if artist:
-                self.audio.tags.add(TPE1(encoding=3, text=artist))
-            if album:
-                self.audio.tags.add(TALB(encoding=3, text=album))
+            cover = None
             if cover_path and os.path.exists(cover_path):
                 mime_type, _ = mimetypes.guess_type(cover_path)
                 mime_type = mime_type or 'image/jpeg'
                 with open(cover_path, 'rb') as img:
-                    self.audio.tags.add(
-                        APIC(
-                            encoding=3,
-                            mime=mime_type,
-                            type=3,
-                            desc=u'Cover',
-                            data=img.read()
-                        )
-                    )
+                    cover = (img.read(), mime_type)
+
+            if isinstance(self.audio.tags, ID3):
+                self.write_id3(title, artist, album, cover)
+            elif isinstance(self.audio.tags, MP4Tags):
+                self.write_mp4(title, artist, album, cover)
+            else:
+                self.write_vorbis(title, artist, album, cover)
             self.audio.save()
             return True
         except Exception as e:
             print(f"Error saving tags: {e}")
             return False
 
+    def write_id3(self, title, artist, album, cover):
+        tags = self.audio.tags
+        if title:
+            tags.add(TIT2(encoding=3, text=title))
+        if artist:
+            tags.add(TPE1(encoding=3, text=artist))
+        if album:
+            tags.add(TALB(encoding=3, text=album))
+        if cover:
+            tags.add(
+                APIC(
+                    encoding=3,
+                    mime=cover[1],
+                    type=3,
+                    desc=u'Cover',
+                    data=cover[0]
+                )
+            )
+
+    def write_mp4(self, title, artist, album, cover):
+        tags = self.audio.tags
+        if title:
+            tags['\xa9nam'] = [title]
+        if artist:
+            tags['\xa9ART'] = [artist]
+        if album:
+            tags['\xa9alb'] = [album]
+        if cover:
+            image_format = MP4Cover.FORMAT_PNG if 'png' in cover[1] else MP4Cover.FORMAT_JPEG
+            tags['covr'] = [MP4Cover(cover[0], imageformat=image_format)]
+
+    def write_vorbis(self, title, artist, album, cover):
+        # Opus, Ogg Vorbis and FLAC
+        tags = self.audio.tags
+        if title:
+            tags['title'] = [title]
+        if artist:
+            tags['artist'] = [artist]
+        if album:
+            tags['album'] = [album]
+        if cover:
+            picture = Picture()
+            picture.type = 3
+            picture.mime = cover[1]
+            picture.desc = u'Cover'
+            picture.data = cover[0]
+            if isinstance(self.audio, FLAC):
+                self.audio.clear_pictures()
+                self.audio.add_picture(picture)
+            else:
+                tags['metadata_block_picture'] = [base64.b64encode(picture.write()).decode('ascii')]
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+
+from src.utils.config import Config
+
+class PixmapCache:
+    # Decoded pixmaps shared by every view, keyed by (path, size) and evicted
+    # least-recently-used once their combined size passes the budget.
+    # GUI thread only, like QPixmap itself.
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, budget=None):
+        self.budget = budget or Config.PIXMAP_CACHE_BUDGET
+        self.entries = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, size=None):
+        return self.lookup((path, size), lambda: self.load(path, size))
+
+    def lookup(self, key, loader):
+        if not key[0]:
+            return QPixmap()
+        pixmap = self.find(key)
+        if pixmap is not None:
+            return pixmap
+        pixmap = loader()
+        if not pixmap.isNull():
+            self.insert(key, pixmap)
+        return pixmap
+
+    def find(self, key):
+        pixmap = self.entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return pixmap
+
+    def load(self, path, size):
+        pixmap = QPixmap(path)
+        if size and not pixmap.isNull() and (pixmap.width() > size or pixmap.height() > size):
+            pixmap = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return pixmap
+
+    def insert(self, key, pixmap):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.used -= self.cost(old)
+        self.entries[key] = pixmap
+        self.used += self.cost(pixmap)
+        while self.used > self.budget and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.used -= self.cost(evicted)
+            self.evictions += 1
+
+    @staticmethod
+    def cost(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.used,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.used = 0
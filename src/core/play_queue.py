@@ -0,0 +1,213 @@
+import random
+from array import array
+from bisect import bisect_left
+
+class PlayQueue:
+    # Song ids in user order, plus a play order while shuffled. Positions are
+    # kept up to date arithmetically on every edit, so nothing ever searches
+    # the queue for the current track.
+    #
+    # Every entry gets a handle (an index into `songs`, so the same song can be
+    # queued twice) and an integer label that increases along the user order.
+    # The user-order position of any handle is then a bisect over the labels,
+    # which is what lets shuffle mode edit the user order and unshuffle land
+    # on the right row. Shuffling is an incremental Fisher-Yates: turning it
+    # on only moves the current track to the front, and each later slot is
+    # drawn from the rest the first time it is needed.
+    GAP = 1 << 32 # label spacing; halves on each insert between two neighbours
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.songs = array('q') # handle -> song id
+        self.labels = array('q') # handle -> order label
+        self.base = array('q') # handles in user order
+        self.play = None # handles in play order while shuffled
+        self.decided = 0 # leading slots of `play` that are fixed
+        self.pos = -1
+
+    def load(self, song_ids, start=0, shuffle=False):
+        self.clear()
+        self.songs = array('q', song_ids)
+        count = len(self.songs)
+        self.labels = array('q', range(self.GAP, (count + 1) * self.GAP, self.GAP))
+        self.base = array('q', range(count))
+        self.pos = start if count else -1
+        if shuffle:
+            self.set_shuffle(True)
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def shuffled(self):
+        return self.play is not None
+
+    @property
+    def order(self):
+        return self.base if self.play is None else self.play
+
+    def current(self):
+        return self.songs[self.order[self.pos]] if self.pos >= 0 else None
+
+    def song_at(self, index):
+        self.decide(index)
+        return self.songs[self.order[index]]
+
+    def ids(self, start=0, count=None):
+        # Song ids in play order, e.g. for a queue view
+        end = len(self.base) if count is None else min(len(self.base), start + count)
+        self.decide(end - 1)
+        return [self.songs[handle] for handle in self.order[start:end]]
+
+    def decide(self, index):
+        if self.play is None:
+            return
+        play = self.play
+        while self.decided <= index:
+            j = random.randrange(self.decided, len(play))
+            play[self.decided], play[j] = play[j], play[self.decided]
+            self.decided += 1
+
+    def jump(self, index):
+        self.decide(index)
+        self.pos = index
+        return self.current()
+
+    def next(self, wrap=False):
+        if self.pos + 1 < len(self.base):
+            return self.jump(self.pos + 1)
+        if wrap and self.base:
+            return self.jump(0)
+        return None
+
+    def prev(self, wrap=False):
+        if self.pos > 0:
+            return self.jump(self.pos - 1)
+        if wrap and self.base:
+            return self.jump(len(self.base) - 1)
+        return None
+
+    def peek_next(self, wrap=False):
+        # The id next() would move to, without moving
+        if self.pos + 1 < len(self.base):
+            return self.song_at(self.pos + 1)
+        if wrap and self.base:
+            return self.song_at(0)
+        return None
+
+    def set_shuffle(self, enabled):
+        if enabled == self.shuffled:
+            return
+        if enabled:
+            self.play = array('q', self.base)
+            if self.pos > 0:
+                self.play[0], self.play[self.pos] = self.play[self.pos], self.play[0]
+            self.decided = 1 if self.pos >= 0 else 0
+            self.pos = min(self.pos, 0)
+        else:
+            if self.pos >= 0:
+                self.pos = self.base_index(self.play[self.pos])
+            self.play = None
+            self.decided = 0
+
+    def insert_next(self, song_ids):
+        # Straight after the current track, in both orders
+        handles = self.new_handles(song_ids)
+        if self.play is None:
+            self.insert_base(self.pos + 1, handles)
+        else:
+            self.insert_base(self.base_index(self.play[self.pos]) + 1 if self.pos >= 0 else 0, handles)
+            self.play[self.pos + 1:self.pos + 1] = handles
+            self.decided = max(self.decided, self.pos + 1) + len(handles)
+
+    def append(self, song_ids):
+        # While shuffled, appended songs join the not-yet-drawn rest
+        handles = self.new_handles(song_ids)
+        self.insert_base(len(self.base), handles)
+        if self.play is not None:
+            self.play.extend(handles)
+
+    def remove(self, index):
+        # Removing the current track makes the one before it current, so
+        # next() carries on with whatever followed it
+        self.decide(index)
+        order = self.order
+        handle = order[index]
+        del order[index]
+        if self.play is not None:
+            del self.base[self.base_index(handle)]
+            self.decided -= 1
+        if index <= self.pos:
+            self.pos -= 1
+
+    def move(self, source, destination):
+        if source == destination:
+            return
+        self.decide(max(source, destination))
+        order = self.order
+        handle = order.pop(source)
+        order.insert(destination, handle)
+        if self.play is None:
+            # The label must sit between the new neighbours
+            self.labels[handle] = self.new_labels(destination, 1, exclude=handle)[0]
+        if source == self.pos:
+            self.pos = destination
+        elif source < self.pos <= destination:
+            self.pos -= 1
+        elif destination <= self.pos < source:
+            self.pos += 1
+
+    def base_index(self, handle):
+        labels = self.labels
+        return bisect_left(self.base, labels[handle], key=labels.__getitem__)
+
+    def new_handles(self, song_ids):
+        start = len(self.songs)
+        self.songs.extend(song_ids)
+        handles = array('q', range(start, len(self.songs)))
+        self.labels.extend(array('q', bytes(8 * len(handles))))
+        return handles
+
+    def insert_base(self, index, handles):
+        labels = self.new_labels(index, len(handles))
+        for handle, label in zip(handles, labels):
+            self.labels[handle] = label
+        self.base[index:index] = handles
+
+    def new_labels(self, index, count, exclude=None):
+        # `count` labels evenly spaced between the entries around base[index]
+        # (skipping `exclude`, which is being moved there)
+        def neighbours():
+            base, labels = self.base, self.labels
+            low = labels[base[index - 1]] if index > 0 else 0
+            after = index + 1 if index < len(base) and base[index] == exclude else index
+            high = labels[base[after]] if after < len(base) else low + (count + 1) * self.GAP
+            return low, high
+
+        low, high = neighbours()
+        if high - low <= count:
+            self.relabel(index, count)
+            low, high = neighbours()
+        step = (high - low) // (count + 1)
+        return [low + step * (i + 1) for i in range(count)]
+
+    def relabel(self, index, count):
+        # Repeated inserts at one spot used up the gap: respread the labels of
+        # the smallest window around it that leaves plenty of room
+        base, labels = self.base, self.labels
+        width = 32
+        while True:
+            lo, hi = max(0, index - width), min(len(base), index + width)
+            low = labels[base[lo - 1]] if lo > 0 else 0
+            if hi < len(base):
+                high = labels[base[hi]]
+            else:
+                high = max(low, labels[base[-1]] if base else 0) + (hi - lo + count + 1) * self.GAP
+            step = (high - low) // (hi - lo + 1)
+            if step > count + 64:
+                break
+            width *= 2
+        for i in range(lo, hi):
+            labels[base[i]] = low + step * (i - lo + 1)
@@ -1,7 +1,10 @@
-import random
 from PySide6.QtCore import QObject, Signal, QUrl
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 
+from src.utils.config import Config
+from src.core.song import SongRegistry
+from src.core.play_queue import PlayQueue
+
 class RepeatMode:
     NONE = 0
     ALL = 1
@@ -9,7 +12,7 @@ class RepeatMode:
 
 class Player(QObject):
     state_changed = Signal(bool)
-    song_changed = Signal(dict)
+    song_changed = Signal(int) # song id
     position_changed = Signal(int)
     duration_changed = Signal(int)
     shuffle_changed = Signal(bool)
@@ -17,42 +20,118 @@ class Player(QObject):
 
     def __init__(self):
         super().__init__()
-        self.original_queue = []
-        self.queue = []
-        self.current_index = -1
+        self.queue = PlayQueue() # song ids; the Song records live in the registry
         self.is_shuffle = False
         self.repeat_mode = RepeatMode.NONE
-        
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        self.audio_output.setVolume(0.7)
-
-        self.player.mediaStatusChanged.connect(self.handle_media_status)
-        self.player.positionChanged.connect(self.position_changed.emit)
-        self.player.durationChanged.connect(self.duration_changed.emit)
-
-    def load_queue(self, songs, start_index=0):
-        self.original_queue = list(songs)
-        if self.is_shuffle:
-            first_song = songs[start_index]
-            remaining = [s for i, s in enumerate(songs) if i != start_index]
-            random.shuffle(remaining)
-            self.queue = [first_song] + remaining
-            self.current_index = 0
-        else:
-            self.queue = list(songs)
-            self.current_index = start_index
-            
+        self.volume = 0.7
+
+        # Two pipelines: `player` is audible, `standby` opens and buffers the
+        # track that comes next so the switch at the boundary is just play()
+        self.player = self.create_player()
+        self.standby = self.create_player()
+        self.preloaded_id = None
+
+    def create_player(self):
+        player = QMediaPlayer()
+        output = QAudioOutput(player)
+        output.setVolume(self.volume)
+        player.setAudioOutput(output)
+        player.mediaStatusChanged.connect(lambda status: self.handle_media_status(player, status))
+        player.positionChanged.connect(lambda position: self.on_position(player, position))
+        player.durationChanged.connect(lambda duration: self.on_duration(player, duration))
+        return player
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for player in (self.player, self.standby):
+            player.audioOutput().setVolume(volume)
+
+    def load_queue(self, song_ids, start_index=0):
+        self.queue.load(song_ids, start_index, self.is_shuffle)
         self.play_current()
 
+    def play_next(self, song_id):
+        self.queue.insert_next([song_id])
+        if len(self.queue) == 1:
+            self.queue.jump(0)
+            self.play_current()
+        else:
+            self.check_preload()
+
+    def add_to_queue(self, song_id):
+        self.queue.append([song_id])
+        if len(self.queue) == 1:
+            self.queue.jump(0)
+            self.play_current()
+        else:
+            self.check_preload()
+
     def play_current(self):
-        if 0 <= self.current_index < len(self.queue):
-            song = self.queue[self.current_index]
-            self.player.setSource(QUrl.fromLocalFile(song['filepath']))
-            self.player.play()
+        song_id = self.queue.current()
+        if song_id is not None:
+            song = SongRegistry.instance().get(song_id)
+            if song is None:
+                return
+            if song_id == self.preloaded_id and self.standby.mediaStatus() != QMediaPlayer.InvalidMedia:
+                self.swap_players()
+            else:
+                self.player.setSource(QUrl.fromLocalFile(song.filepath))
+                self.player.play()
             self.state_changed.emit(True)
-            self.song_changed.emit(song)
+            self.song_changed.emit(song.id)
+            self.check_preload()
+
+    def swap_players(self):
+        self.player.stop()
+        self.player, self.standby = self.standby, self.player
+        self.player.play()
+        self.release_standby()
+        # The standby's duration arrived while it was muted to the UI
+        self.duration_changed.emit(self.player.duration())
+        self.position_changed.emit(self.player.position())
+
+    def upcoming(self):
+        # The song that starts when the current one ends
+        if self.repeat_mode == RepeatMode.ONE:
+            return self.queue.current()
+        return self.queue.peek_next(wrap=self.repeat_mode == RepeatMode.ALL)
+
+    def check_preload(self):
+        # Runs on position ticks and after anything that can change what
+        # comes next (queue edits, shuffle, repeat); a stale preload is dropped
+        upcoming = self.upcoming() if self.queue else None
+        if self.preloaded_id is not None and self.preloaded_id != upcoming:
+            self.release_standby()
+        if self.preloaded_id is None and upcoming is not None:
+            duration = self.player.duration()
+            if duration > 0 and duration - self.player.position() <= Config.PRELOAD_LEAD_MS:
+                self.preload(upcoming)
+
+    def preload(self, song_id):
+        song = SongRegistry.instance().get(song_id)
+        if song is None:
+            return
+        self.standby.setSource(QUrl.fromLocalFile(song.filepath))
+        # Paused rather than stopped so the backend prerolls the first buffers
+        self.standby.pause()
+        self.preloaded_id = song_id
+
+    def release_standby(self):
+        self.standby.stop()
+        self.standby.setSource(QUrl())
+        self.preloaded_id = None
+
+    def on_position(self, player, position):
+        # Only the audible player reports to the UI
+        if player is self.player:
+            self.position_changed.emit(position)
+            if self.preloaded_id is None:
+                self.check_preload()
+
+    def on_duration(self, player, duration):
+        if player is self.player:
+            self.duration_changed.emit(duration)
+            self.check_preload()
 
     def toggle_play(self):
         if self.player.playbackState() == QMediaPlayer.PlayingState:
@@ -65,43 +144,29 @@ class Player(QObject):
     def next(self):
         if not self.queue: return
         if self.repeat_mode == RepeatMode.ONE:
-            self.player.setPosition(0)
-            self.player.play()
-        elif self.current_index < len(self.queue) - 1:
-            self.current_index += 1
-            self.play_current()
-        elif self.repeat_mode == RepeatMode.ALL:
-            self.current_index = 0
+            if self.preloaded_id == self.queue.current():
+                self.swap_players()
+                self.check_preload()
+            else:
+                self.player.setPosition(0)
+                self.player.play()
+        elif self.queue.next(wrap=self.repeat_mode == RepeatMode.ALL) is not None:
             self.play_current()
         else:
             self.player.stop()
+            self.release_standby()
             self.state_changed.emit(False)
 
     def prev(self):
         if self.player.position() > 3000:
             self.player.setPosition(0)
-        elif self.current_index > 0:
-            self.current_index -= 1
-            self.play_current()
-        elif self.repeat_mode == RepeatMode.ALL:
-            self.current_index = len(self.queue) - 1
+        elif self.queue.prev(wrap=self.repeat_mode == RepeatMode.ALL) is not None:
             self.play_current()
 
     def toggle_shuffle(self):
         self.is_shuffle = not self.is_shuffle
-        if self.queue:
-            current_song = self.queue[self.current_index]
-            if self.is_shuffle:
-                remaining = [s for s in self.original_queue if s != current_song]
-                random.shuffle(remaining)
-                self.queue = [current_song] + remaining
-                self.current_index = 0
-            else:
-                self.queue = list(self.original_queue)
-                for i, s in enumerate(self.queue):
-                    if s['filepath'] == current_song['filepath']:
-                        self.current_index = i
-                        break
+        self.queue.set_shuffle(self.is_shuffle)
+        self.check_preload()
         self.shuffle_changed.emit(self.is_shuffle)
 
     def toggle_repeat(self):
@@ -112,9 +177,10 @@ class Player(QObject):
         else:
             self.repeat_mode = RepeatMode.NONE
             
+        self.check_preload()
         self.repeat_changed.emit(self.repeat_mode)
 
-    def handle_media_status(self, status):
-        if status == QMediaPlayer.EndOfMedia:
+    def handle_media_status(self, player, status):
+        if player is self.player and status == QMediaPlayer.EndOfMedia:
             self.next()
 
@@ -0,0 +1,61 @@
+import sys
+from collections import namedtuple
+
+class Song(namedtuple('Song', ('id', 'title', 'artist', 'album', 'filepath', 'cover_path', 'duration',
+                               'size', 'mtime', 'inode', 'date_added'))):
+    # One library row as an immutable tuple with no instance dict: about 130
+    # bytes per song against roughly 470 for dict(row). Get instances from
+    # SongRegistry so every list, model and queue shares the same object.
+    __slots__ = ()
+
+    @classmethod
+    def columns(cls, alias=None):
+        # SELECT list matching the field order, for Song._make(row)
+        prefix = f"{alias}." if alias else ""
+        return ', '.join(prefix + field for field in cls._fields)
+
+class SongRegistry:
+    # id -> Song for every row read from the database. Reading a row that is
+    # unchanged hands back the existing instance; a changed row replaces it.
+    # Plain dict operations, so rows interned from the filter thread are safe.
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.songs = {}
+
+    @staticmethod
+    def shared(text):
+        return sys.intern(text) if text else text
+
+    def intern(self, row):
+        values = tuple(row)
+        current = self.songs.get(values[0])
+        if current == values:
+            return current
+        # Artist, album and cover path repeat across an album's tracks
+        shared = self.shared
+        song = Song(values[0], values[1], shared(values[2]), shared(values[3]), values[4], shared(values[5]),
+                    *values[6:])
+        self.songs[song.id] = song
+        return song
+
+    def get(self, song_id):
+        return self.songs.get(song_id)
+
+    def resolve(self, song_ids):
+        # Ids whose song has since been removed are skipped
+        songs = self.songs
+        return [songs[song_id] for song_id in song_ids if song_id in songs]
+
+    def forget(self, song_ids):
+        for song_id in song_ids:
+            self.songs.pop(song_id, None)
+
+    def __len__(self):
+        return len(self.songs)
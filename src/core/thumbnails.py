@@ -0,0 +1,91 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+from PySide6.QtCore import QObject, Signal
+
+class ThumbnailService(QObject):
+    # Size classes used by the UI: collapsed widget, library row,
+    # now-playing bar / playlist card, edit dialog
+    SIZES = (40, 50, 60, 160)
+    thumbnail_ready = Signal(str) # cover path
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rebbit-thumbs")
+        self.pending = set()
+        self.failed = set() # covers that couldn't be read; not retried
+
+    @staticmethod
+    def thumb_path(cover_path, size):
+        base, _ = os.path.splitext(cover_path)
+        return f"{base}_{size}.jpg"
+
+    @staticmethod
+    def generate(cover_path):
+        # Album tracks share one cover, so most calls find the pyramid built
+        missing = [s for s in ThumbnailService.SIZES
+                   if not os.path.exists(ThumbnailService.thumb_path(cover_path, s))]
+        if not missing:
+            return
+        # Decode once, then step down through the sizes largest-first so each
+        # resample starts from the previous (already small) image
+        with Image.open(cover_path) as img:
+            largest = max(ThumbnailService.SIZES)
+            img.draft('RGB', (largest, largest))
+            img = img.convert('RGB')
+            for size in sorted(ThumbnailService.SIZES, reverse=True):
+                img = ImageOps.fit(img, (size, size), Image.LANCZOS)
+                target = ThumbnailService.thumb_path(cover_path, size)
+                if size not in missing:
+                    continue
+                # Thread-pool scan workers share a pid, so use a unique temp name
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as out:
+                        img.save(out, 'JPEG', quality=88)
+                    os.replace(tmp_path, target)
+                except OSError:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+
+    def path_for(self, cover_path, size):
+        # Returns the pre-scaled variant when it exists. Otherwise the full
+        # cover is returned this once and the pyramid is built in the background.
+        if not cover_path:
+            return None
+        thumb = self.thumb_path(cover_path, size)
+        if os.path.exists(thumb):
+            return thumb
+        if cover_path not in self.failed:
+            self.request(cover_path)
+        return cover_path
+
+    def request(self, cover_path):
+        # Explicit requests (a cover was just stored) retry a failed cover;
+        # path_for, called while painting, doesn't
+        if cover_path in self.pending:
+            return
+        self.failed.discard(cover_path)
+        self.pending.add(cover_path)
+        future = self.executor.submit(self.generate, cover_path)
+        future.add_done_callback(lambda f: self.on_generated(cover_path, f))
+
+    def on_generated(self, cover_path, future):
+        # Runs on the executor thread; mark the failure before the cover
+        # stops being pending so path_for can't slip a retry in between
+        if future.exception():
+            self.failed.add(cover_path)
+            self.pending.discard(cover_path)
+            print(f"Thumbnail Error for {cover_path}: {future.exception()}")
+        else:
+            self.pending.discard(cover_path)
+            self.thumbnail_ready.emit(cover_path)
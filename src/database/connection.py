@@ -0,0 +1,63 @@
+import sqlite3
+import threading
+
+from src.utils.config import Config
+
+# One long-lived connection per thread (GUI thread, scanner QThread, ...),
+# since sqlite3 connections can't be shared across threads.
+class ConnectionManager:
+    _local = threading.local()
+    _schema_lock = threading.Lock()
+    _schema_ready = set()
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA temp_store = MEMORY",
+        f"PRAGMA mmap_size = {Config.DB_MMAP_SIZE}",
+        f"PRAGMA cache_size = -{Config.DB_CACHE_KB}",
+    )
+
+    @classmethod
+    def get(cls, db_path):
+        db_path = str(db_path)
+        connections = getattr(cls._local, 'connections', None)
+        if connections is None:
+            connections = cls._local.connections = {}
+        conn = connections.get(db_path)
+        if conn is None:
+            conn = cls._open(db_path)
+            connections[db_path] = conn
+        return conn
+
+    @classmethod
+    def _open(cls, db_path):
+        conn = sqlite3.connect(db_path, cached_statements=Config.DB_STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        for pragma in cls.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @classmethod
+    def ensure_schema(cls, db_path, init_fn):
+        # Schema init runs once per database file per process
+        db_path = str(db_path)
+        if db_path in cls._schema_ready:
+            return
+        with cls._schema_lock:
+            if db_path not in cls._schema_ready:
+                init_fn()
+                cls._schema_ready.add(db_path)
+
+    @classmethod
+    def close(cls, db_path=None):
+        # Worker threads should call this before exiting
+        connections = getattr(cls._local, 'connections', None)
+        if not connections:
+            return
+        paths = [str(db_path)] if db_path else list(connections)
+        for path in paths:
+            conn = connections.pop(path, None)
+            if conn is not None:
+                conn.close()
@@ -1,192 +1,353 @@
+import os
+import re
 import sqlite3
+from itertools import islice
 from src.utils.config import Config
+from src.database import migrations
+from src.database.connection import ConnectionManager
+from src.core.song import Song, SongRegistry
 
 class DBManager:
+    # Keyset columns per sort order; each is backed by an index whose implicit
+    # rowid suffix makes (cols..., id) a unique, index-ordered key
+    SORT_KEYS = {
+        'title': ('title',),
+        'artist': ('artist', 'title'),
+        'album': ('album', 'title'),
+        'date_added': ('date_added',),
+    }
+
     def __init__(self):
-        self.db_path = Config.BASE_DIR / "data" / "rebbit.db"
-        self.init_db()
+        self.db_path = Config.DB_PATH
+        ConnectionManager.ensure_schema(self.db_path, self.init_db)
 
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON") 
-        return conn
+        return ConnectionManager.get(self.db_path)
 
     def init_db(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS songs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT,
-                artist TEXT,
-                album TEXT,
-                filepath TEXT UNIQUE,
-                cover_path TEXT,
-                duration INTEGER,
-                date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playlists (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        migrations.migrate(self.get_connection())
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playlist_songs (
-                playlist_id INTEGER,
-                song_id INTEGER,
-                FOREIGN KEY(playlist_id) REFERENCES playlists(id) ON DELETE CASCADE,
-                FOREIGN KEY(song_id) REFERENCES songs(id) ON DELETE CASCADE,
-                PRIMARY KEY (playlist_id, song_id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+    def check_query_plans(self):
+        return migrations.check_plans(self.get_connection())
+
+    def song_row(self, song_data):
+        # Sort columns are never NULL so keyset comparisons stay well-defined
+        filepath = song_data.get('filepath')
+        return (
+            song_data.get('title') or os.path.basename(filepath or ''),
+            song_data.get('artist') or 'Unknown Artist',
+            song_data.get('album') or 'Unknown Album',
+            filepath,
+            song_data.get('cover_path'),
+            song_data.get('duration') or 0,
+            song_data.get('size'),
+            song_data.get('mtime'),
+            song_data.get('inode')
+        )
 
     def add_song(self, song_data):
         conn = self.get_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO songs (title, artist, album, filepath, cover_path, duration)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                song_data.get('title'),
-                song_data.get('artist'),
-                song_data.get('album'),
-                song_data.get('filepath'),
-                song_data.get('cover_path'),
-                song_data.get('duration')
-            ))
-            conn.commit()
+            row = self.song_row(song_data)
+            with conn:
+                self.register_covers(conn, [row[4]])
+                conn.execute('''
+                    INSERT OR IGNORE INTO songs (title, artist, album, filepath, cover_path, duration, size, mtime, inode)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', row)
+        except Exception as e:
+            print(f"DB Error: {e}")
+
+    def add_songs(self, songs, batch_size=None):
+        return self.write_batches('''
+            INSERT OR IGNORE INTO songs (title, artist, album, filepath, cover_path, duration, size, mtime, inode)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (self.song_row(s) for s in songs), batch_size, cover_column=4)
+
+    def update_songs(self, songs, batch_size=None):
+        return self.write_batches('''
+            UPDATE songs
+            SET title = ?, artist = ?, album = ?, filepath = ?, cover_path = ?, duration = ?, size = ?, mtime = ?, inode = ?
+            WHERE id = ?
+        ''', (self.song_row(s) + (s['id'],) for s in songs), batch_size, cover_column=4)
+
+    def move_songs(self, moves, batch_size=None):
+        # moves: (song_id, new_filepath, size, mtime, inode)
+        return self.write_batches('''
+            UPDATE songs SET filepath = ?, size = ?, mtime = ?, inode = ? WHERE id = ?
+        ''', ((path, size, mtime, inode, song_id) for song_id, path, size, mtime, inode in moves), batch_size)
+
+    def remove_songs(self, song_ids, batch_size=None):
+        return self.write_batches('DELETE FROM songs WHERE id = ?', ((song_id,) for song_id in song_ids), batch_size)
+
+    def write_batches(self, sql, rows, batch_size=None, cover_column=None):
+        batch_size = batch_size or Config.DB_BATCH_SIZE
+        conn = self.get_connection()
+        rows = iter(rows)
+        written = 0
+        while True:
+            # Pull the batch before opening the transaction so slow producers
+            # (metadata parsing) never hold the write lock
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            try:
+                with conn:
+                    if cover_column is not None:
+                        self.register_covers(conn, (row[cover_column] for row in batch))
+                    cursor = conn.executemany(sql, batch)
+                    written += cursor.rowcount
+            except Exception as e:
+                print(f"DB Error: {e}")
+        return written
+
+    def register_covers(self, conn, cover_paths):
+        # Cover rows must exist before songs reference them so the refcount
+        # triggers have something to count against
+        rows = []
+        for path in set(filter(None, cover_paths)):
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = None
+            rows.append((path, self.cover_digest(path), size))
+        conn.executemany('INSERT OR IGNORE INTO covers (path, hash, size) VALUES (?, ?, ?)', rows)
+
+    @staticmethod
+    def cover_digest(path):
+        # Cached covers are named after the hash of their bytes
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def touch_covers(self, cover_paths):
+        # last_used drives cover cache eviction, so it tracks display, not
+        # just assignment by the refcount triggers
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.executemany('UPDATE covers SET last_used = CURRENT_TIMESTAMP WHERE path = ?',
+                                 ((path,) for path in cover_paths))
         except Exception as e:
             print(f"DB Error: {e}")
-        finally:
-            conn.close()
+
+    def get_fingerprints(self, directory=None):
+        conn = self.get_connection()
+        if directory is None:
+            cursor = conn.execute('SELECT filepath, id, size, mtime, inode FROM songs')
+        else:
+            # Range over the filepath index instead of LIKE, which can't use it
+            prefix = os.path.join(directory, '')
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            cursor = conn.execute('''
+                SELECT filepath, id, size, mtime, inode FROM songs
+                WHERE filepath >= ? AND filepath < ?
+            ''', (prefix, upper))
+        return {row[0]: tuple(row[1:]) for row in cursor}
+
+    def get_ids_by_paths(self, paths):
+        return self.select_in('SELECT id FROM songs WHERE filepath IN ({})', list(paths), lambda row: row[0])
+
+    def get_songs_by_ids(self, song_ids):
+        return self.select_in(f'SELECT {Song.columns()} FROM songs WHERE id IN ({{}})', list(song_ids),
+                              SongRegistry.instance().intern)
+
+    def select_in(self, sql, values, convert, chunk_size=500):
+        conn = self.get_connection()
+        results = []
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            cursor = conn.execute(sql.format(', '.join('?' * len(chunk))), chunk)
+            results.extend(convert(row) for row in cursor)
+        return results
+
+    def songs_from(self, cursor):
+        # Rows become the shared Song instances from the registry
+        intern = SongRegistry.instance().intern
+        return [intern(row) for row in cursor]
 
     def get_all_songs(self):
+        return self.songs_from(self.get_connection().execute(f'SELECT {Song.columns()} FROM songs ORDER BY title ASC'))
+
+    def iter_songs(self, order_by='title', after_key=None, page_size=None):
+        page_size = page_size or Config.LIBRARY_PAGE_SIZE
+        columns = self.SORT_KEYS[order_by] + ('id',)
+        order = ', '.join(columns)
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM songs ORDER BY title ASC')
-        songs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return songs
+        while True:
+            if after_key is None:
+                rows = conn.execute(f'SELECT {Song.columns()} FROM songs ORDER BY {order} LIMIT ?',
+                                    (page_size,)).fetchall()
+            else:
+                placeholders = ', '.join('?' * len(columns))
+                rows = conn.execute(
+                    f'SELECT {Song.columns()} FROM songs WHERE ({order}) > ({placeholders}) ORDER BY {order} LIMIT ?',
+                    (*after_key, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            page = self.songs_from(rows)
+            yield page
+            if len(rows) < page_size:
+                return
+            after_key = self.sort_key(page[-1], order_by)
+
+    def sort_key(self, song, order_by='title'):
+        return tuple(getattr(song, col) for col in self.SORT_KEYS[order_by]) + (song.id,)
 
     def song_exists(self, filepath):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id FROM songs WHERE filepath = ?', (filepath,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+        cursor = self.get_connection().execute('SELECT id FROM songs WHERE filepath = ?', (filepath,))
+        return cursor.fetchone() is not None
+
+    def search_songs(self, query, limit=None):
+        terms = re.findall(r'\w+', query.lower())
+        if not terms:
+            return []
+        # Every term must match as a word prefix: "bea gir" -> "bea"* "gir"*
+        match = ' '.join(f'"{term}"*' for term in terms)
+        cursor = self.get_connection().execute(f'''
+            SELECT {Song.columns('s')} FROM songs_fts
+            JOIN songs s ON s.id = songs_fts.rowid
+            WHERE songs_fts MATCH ?
+            ORDER BY bm25(songs_fts, 10.0, 5.0, 1.0), s.title
+            LIMIT ?
+        ''', (match, limit if limit is not None else -1))
+        return self.songs_from(cursor)
+
+    def get_artists(self):
+        cursor = self.get_connection().execute('SELECT * FROM artists ORDER BY name')
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_albums(self):
+        cursor = self.get_connection().execute('SELECT * FROM albums ORDER BY name')
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_songs_by_artist(self, artist):
+        return self.songs_from(self.get_connection().execute(
+            f'SELECT {Song.columns()} FROM songs WHERE artist = ? ORDER BY title, id', (artist,)))
+
+    def get_songs_by_album(self, album):
+        return self.songs_from(self.get_connection().execute(
+            f'SELECT {Song.columns()} FROM songs WHERE album = ? ORDER BY title, id', (album,)))
 
     def create_playlist(self, name):
         conn = self.get_connection()
         try:
-            conn.execute('INSERT INTO playlists (name) VALUES (?)', (name,))
-            conn.commit()
+            with conn:
+                conn.execute('INSERT INTO playlists (name) VALUES (?)', (name,))
             return True
         except sqlite3.IntegrityError:
-            return False 
-        finally:
-            conn.close()
+            return False
 
     def get_playlists(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT p.id, p.name, COUNT(ps.song_id) as song_count 
-            FROM playlists p 
-            LEFT JOIN playlist_songs ps ON p.id = ps.playlist_id 
+        cursor = self.get_connection().execute('''
+            SELECT p.id, p.name, COUNT(ps.song_id) as song_count
+            FROM playlists p
+            LEFT JOIN playlist_songs ps ON p.id = ps.playlist_id
             GROUP BY p.id
         ''')
-        playlists = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return playlists
+        return [dict(row) for row in cursor.fetchall()]
 
-    def add_to_playlist(self, playlist_id, song_path):
+    def add_to_playlist(self, playlist_id, song_id):
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT id FROM songs WHERE filepath = ?', (song_path,))
-        res = cursor.fetchone()
-        if res:
-            song_id = res['id']
-            try:
-                cursor.execute('INSERT INTO playlist_songs (playlist_id, song_id) VALUES (?, ?)', (playlist_id, song_id))
-                conn.commit()
-            except sqlite3.IntegrityError:
-                pass 
-        conn.close()
+        try:
+            with conn:
+                conn.execute('INSERT INTO playlist_songs (playlist_id, song_id) VALUES (?, ?)', (playlist_id, song_id))
+        except sqlite3.IntegrityError:
+            pass
 
     def get_playlist_songs(self, playlist_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT s.* FROM songs s
+        cursor = self.get_connection().execute(f'''
+            SELECT {Song.columns('s')} FROM songs s
             JOIN playlist_songs ps ON s.id = ps.song_id
             WHERE ps.playlist_id = ?
         ''', (playlist_id,))
-        songs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return songs
-        
+        return self.songs_from(cursor)
+
     def rename_playlist(self, playlist_id, new_name):
         conn = self.get_connection()
         try:
-            conn.execute('UPDATE playlists SET name = ? WHERE id = ?', (new_name, playlist_id))
-            conn.commit()
+            with conn:
+                conn.execute('UPDATE playlists SET name = ? WHERE id = ?', (new_name, playlist_id))
             return True
         except sqlite3.IntegrityError:
-            return False 
-        finally:
-            conn.close()
+            return False
 
     def delete_playlist(self, playlist_id):
         conn = self.get_connection()
-        conn.execute('DELETE FROM playlists WHERE id = ?', (playlist_id,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute('DELETE FROM playlists WHERE id = ?', (playlist_id,))
 
-    def remove_from_playlist(self, playlist_id, song_path):
+    def remove_from_playlist(self, playlist_id, song_id):
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT id FROM songs WHERE filepath = ?', (song_path,))
-        res = cursor.fetchone()
-        if res:
-            song_id = res['id']
+        with conn:
             conn.execute('DELETE FROM playlist_songs WHERE playlist_id = ? AND song_id = ?', (playlist_id, song_id))
-            conn.commit()
-        conn.close()
-    
+
     def update_song_metadata(self, song_id, title, artist, album, cover_path, new_filepath=None):
         conn = self.get_connection()
-        cursor = conn.cursor()
         try:
-            if new_filepath:
-                cursor.execute('''
-                    UPDATE songs 
-                    SET title = ?, artist = ?, album = ?, cover_path = ?, filepath = ?
-                    WHERE id = ?
-                ''', (title, artist, album, cover_path, new_filepath, song_id))
-            else:
-                cursor.execute('''
-                    UPDATE songs 
-                    SET title = ?, artist = ?, album = ?, cover_path = ?
-                    WHERE id = ?
-                ''', (title, artist, album, cover_path, song_id))
-            conn.commit()
+            with conn:
+                self.register_covers(conn, [cover_path])
+                if new_filepath:
+                    conn.execute('''
+                        UPDATE songs
+                        SET title = ?, artist = ?, album = ?, cover_path = ?, filepath = ?
+                        WHERE id = ?
+                    ''', (title, artist, album, cover_path, new_filepath, song_id))
+                else:
+                    conn.execute('''
+                        UPDATE songs
+                        SET title = ?, artist = ?, album = ?, cover_path = ?
+                        WHERE id = ?
+                    ''', (title, artist, album, cover_path, song_id))
             return True
         except Exception as e:
             print(f"DB Update Error: {e}")
             return False
-        finally:
-            conn.close()
 
+    def get_download_groups(self):
+        cursor = self.get_connection().execute('SELECT * FROM download_groups ORDER BY id')
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_downloads(self):
+        cursor = self.get_connection().execute('SELECT * FROM downloads ORDER BY id')
+        return [dict(row) for row in cursor.fetchall()]
+
+    def save_downloads(self, groups, downloads):
+        # Upserts rather than INSERT OR REPLACE: replacing a group row would
+        # cascade-delete its downloads
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO download_groups (id, url, title) VALUES (?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET url = excluded.url, title = excluded.title
+                ''', groups)
+                conn.executemany('''
+                    INSERT INTO downloads (id, group_id, url, title, priority, seq, state, audio_format, partial_files, fetched_files,
+                                           library_files, error)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        priority = excluded.priority, seq = excluded.seq, state = excluded.state,
+                        partial_files = excluded.partial_files, fetched_files = excluded.fetched_files,
+                        library_files = excluded.library_files,
+                        error = excluded.error
+                ''', downloads)
+        except Exception as e:
+            print(f"DB Error: {e}")
+
+    def prune_downloads(self):
+        # Finished downloads are dropped unless a playlist they belong to
+        # still has unfinished tracks
+        conn = self.get_connection()
+        with conn:
+            conn.execute('''
+                DELETE FROM downloads WHERE state IN ('completed', 'cancelled') AND (
+                    group_id IS NULL OR NOT EXISTS (
+                        SELECT 1 FROM downloads d
+                        WHERE d.group_id = downloads.group_id AND d.state NOT IN ('completed', 'cancelled')
+                    )
+                )
+            ''')
+            conn.execute('''
+                DELETE FROM download_groups
+                WHERE NOT EXISTS (SELECT 1 FROM downloads WHERE group_id = download_groups.id)
+            ''')
@@ -0,0 +1,303 @@
+def aggregate_statements(table, column):
+    # Per-value rollup of songs.<column> kept current by triggers, so browse
+    # views read one small indexed table instead of grouping the library
+    add = f"""
+        INSERT INTO {table} (name, track_count, total_duration, cover_path)
+        VALUES (new.{column}, 1, COALESCE(new.duration, 0), new.cover_path)
+        ON CONFLICT(name) DO UPDATE SET
+            track_count = track_count + 1,
+            total_duration = total_duration + excluded.total_duration,
+            cover_path = COALESCE(cover_path, excluded.cover_path);
+    """
+    drop = f"""
+        UPDATE {table} SET track_count = track_count - 1, total_duration = total_duration - COALESCE(old.duration, 0)
+        WHERE name = old.{column};
+        DELETE FROM {table} WHERE name = old.{column} AND track_count <= 0;
+        UPDATE {table} SET cover_path = (
+            SELECT cover_path FROM songs WHERE {column} = old.{column} AND cover_path IS NOT NULL LIMIT 1
+        ) WHERE name = old.{column} AND cover_path IS old.cover_path;
+    """
+    return [
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            name TEXT PRIMARY KEY,
+            track_count INTEGER NOT NULL DEFAULT 0,
+            total_duration INTEGER NOT NULL DEFAULT 0,
+            cover_path TEXT
+        ) WITHOUT ROWID
+        """,
+        f"CREATE TRIGGER IF NOT EXISTS songs_{table}_ai AFTER INSERT ON songs BEGIN {add} END",
+        f"CREATE TRIGGER IF NOT EXISTS songs_{table}_ad AFTER DELETE ON songs BEGIN {drop} END",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS songs_{table}_au AFTER UPDATE OF {column}, duration, cover_path ON songs
+        BEGIN {drop} {add} END
+        """,
+        f"""
+        INSERT OR REPLACE INTO {table} (name, track_count, total_duration, cover_path)
+        SELECT {column}, COUNT(*), COALESCE(SUM(duration), 0), MAX(cover_path) FROM songs GROUP BY {column}
+        """,
+    ]
+
+# os.path.basename in SQL: rtrim() strips every trailing character that
+# isn't a separator, leaving the directory part, and the rest is the name
+BASENAME_SQL = '''
+    substr(replace(COALESCE(filepath, ''), '\\', '/'),
+           length(rtrim(replace(COALESCE(filepath, ''), '\\', '/'),
+                        replace(replace(COALESCE(filepath, ''), '\\', '/'), '/', ''))) + 1)
+'''
+
+class Migration:
+    def __init__(self, version, statements, plan_checks=()):
+        self.version = version
+        self.statements = statements
+        # (query, params, fragment the EXPLAIN QUERY PLAN detail must contain;
+        # a leading "NOT " means it must not appear)
+        self.plan_checks = plan_checks
+
+MIGRATIONS = [
+    Migration(1, [
+        '''
+        CREATE TABLE IF NOT EXISTS songs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            artist TEXT,
+            album TEXT,
+            filepath TEXT UNIQUE,
+            cover_path TEXT,
+            duration INTEGER,
+            date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS playlists (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS playlist_songs (
+            playlist_id INTEGER,
+            song_id INTEGER,
+            FOREIGN KEY(playlist_id) REFERENCES playlists(id) ON DELETE CASCADE,
+            FOREIGN KEY(song_id) REFERENCES songs(id) ON DELETE CASCADE,
+            PRIMARY KEY (playlist_id, song_id)
+        )
+        ''',
+    ], plan_checks=[
+        ('SELECT id FROM songs WHERE filepath = ?', ('',), 'sqlite_autoindex_songs_1'),
+        ('SELECT s.* FROM songs s JOIN playlist_songs ps ON s.id = ps.song_id WHERE ps.playlist_id = ?',
+         (0,), 'sqlite_autoindex_playlist_songs_1'),
+        ('DELETE FROM playlist_songs WHERE playlist_id = ? AND song_id = ?',
+         (0, 0), 'sqlite_autoindex_playlist_songs_1'),
+    ]),
+
+    Migration(2, [
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+            title, artist, album,
+            content='songs', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS songs_fts_ai AFTER INSERT ON songs BEGIN
+            INSERT INTO songs_fts(rowid, title, artist, album)
+            VALUES (new.id, new.title, new.artist, new.album);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS songs_fts_ad AFTER DELETE ON songs BEGIN
+            INSERT INTO songs_fts(songs_fts, rowid, title, artist, album)
+            VALUES ('delete', old.id, old.title, old.artist, old.album);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS songs_fts_au AFTER UPDATE OF title, artist, album ON songs BEGIN
+            INSERT INTO songs_fts(songs_fts, rowid, title, artist, album)
+            VALUES ('delete', old.id, old.title, old.artist, old.album);
+            INSERT INTO songs_fts(rowid, title, artist, album)
+            VALUES (new.id, new.title, new.artist, new.album);
+        END
+        ''',
+        "INSERT INTO songs_fts(songs_fts) VALUES ('rebuild')",
+    ], plan_checks=[
+        ("SELECT rowid FROM songs_fts WHERE songs_fts MATCH ?", ('a*',), 'VIRTUAL TABLE INDEX'),
+    ]),
+
+    Migration(3, [
+        'CREATE INDEX IF NOT EXISTS idx_songs_title ON songs(title)',
+        'CREATE INDEX IF NOT EXISTS idx_songs_artist ON songs(artist, title)',
+        'CREATE INDEX IF NOT EXISTS idx_songs_album ON songs(album, title)',
+        'CREATE INDEX IF NOT EXISTS idx_songs_date_added ON songs(date_added)',
+        # Without this, ON DELETE CASCADE from songs scans all of playlist_songs
+        'CREATE INDEX IF NOT EXISTS idx_playlist_songs_song ON playlist_songs(song_id)',
+        'ANALYZE',
+    ], plan_checks=[
+        ('SELECT * FROM songs ORDER BY title ASC', (), 'idx_songs_title'),
+        ('SELECT * FROM songs WHERE artist = ? ORDER BY title', ('',), 'idx_songs_artist'),
+        ('SELECT * FROM songs WHERE album = ? ORDER BY title', ('',), 'idx_songs_album'),
+        ('SELECT * FROM songs ORDER BY date_added DESC', (), 'idx_songs_date_added'),
+        ('SELECT * FROM songs WHERE (title, id) > (?, ?) ORDER BY title, id LIMIT 1', ('', 0), 'idx_songs_title'),
+        ('SELECT * FROM songs WHERE (artist, title, id) > (?, ?, ?) ORDER BY artist, title, id LIMIT 1',
+         ('', '', 0), 'idx_songs_artist'),
+        ('SELECT 1 FROM playlist_songs WHERE song_id = ?', (0,), 'idx_playlist_songs_song'),
+        ('''
+            SELECT p.id, p.name, COUNT(ps.song_id) as song_count
+            FROM playlists p
+            LEFT JOIN playlist_songs ps ON p.id = ps.playlist_id
+            GROUP BY p.id
+        ''', (), 'COVERING INDEX sqlite_autoindex_playlist_songs_1'),
+    ]),
+
+    Migration(4, [
+        "UPDATE songs SET artist = 'Unknown Artist' WHERE artist IS NULL OR artist = ''",
+        "UPDATE songs SET album = 'Unknown Album' WHERE album IS NULL OR album = ''",
+        f"UPDATE songs SET title = {BASENAME_SQL} WHERE title IS NULL OR title = ''",
+        "UPDATE songs SET duration = 0 WHERE duration IS NULL",
+    ], plan_checks=[
+        # Keyset pages compare whole rows, which only works once the sort
+        # columns are never NULL
+        ('SELECT * FROM songs WHERE (album, title, id) > (?, ?, ?) ORDER BY album, title, id LIMIT 1',
+         ('', '', 0), 'idx_songs_album'),
+        ('SELECT * FROM songs WHERE (date_added, id) > (?, ?) ORDER BY date_added, id LIMIT 1',
+         ('', 0), 'idx_songs_date_added'),
+    ]),
+
+    # File fingerprints for incremental rescans; NULL forces a re-parse
+    Migration(5, [
+        'ALTER TABLE songs ADD COLUMN size INTEGER',
+        'ALTER TABLE songs ADD COLUMN mtime INTEGER',
+        'ALTER TABLE songs ADD COLUMN inode INTEGER',
+    ], plan_checks=[
+        # Per-folder delta scans read fingerprints over a filepath range
+        ('SELECT filepath, id, size, mtime, inode FROM songs WHERE filepath >= ? AND filepath < ?',
+         ('', ''), 'SEARCH songs USING INDEX sqlite_autoindex_songs_1'),
+    ]),
+
+    # Content-addressed cover cache; refcount = number of songs using the file
+    Migration(6, [
+        '''
+        CREATE TABLE IF NOT EXISTS covers (
+            path TEXT PRIMARY KEY,
+            hash TEXT,
+            size INTEGER,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            last_used TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_covers_refcount ON covers(refcount)',
+        'CREATE INDEX IF NOT EXISTS idx_covers_last_used ON covers(last_used)',
+        'CREATE INDEX IF NOT EXISTS idx_songs_cover_path ON songs(cover_path)',
+        '''
+        CREATE TRIGGER IF NOT EXISTS covers_ref_ai AFTER INSERT ON songs
+        WHEN new.cover_path IS NOT NULL BEGIN
+            UPDATE covers SET refcount = refcount + 1, last_used = CURRENT_TIMESTAMP
+            WHERE path = new.cover_path;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS covers_ref_ad AFTER DELETE ON songs
+        WHEN old.cover_path IS NOT NULL BEGIN
+            UPDATE covers SET refcount = refcount - 1 WHERE path = old.cover_path;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS covers_ref_au AFTER UPDATE OF cover_path ON songs
+        WHEN old.cover_path IS NOT new.cover_path BEGIN
+            UPDATE covers SET refcount = refcount - 1 WHERE path = old.cover_path;
+            UPDATE covers SET refcount = refcount + 1, last_used = CURRENT_TIMESTAMP
+            WHERE path = new.cover_path;
+        END
+        ''',
+        '''
+        INSERT OR IGNORE INTO covers (path, refcount)
+        SELECT cover_path, COUNT(*) FROM songs WHERE cover_path IS NOT NULL GROUP BY cover_path
+        ''',
+    ], plan_checks=[
+        ('UPDATE covers SET refcount = refcount - 1 WHERE path = ?', ('',), 'sqlite_autoindex_covers_1'),
+        ('SELECT path FROM covers WHERE refcount <= 0', (), 'idx_covers_refcount'),
+        ('UPDATE songs SET cover_path = NULL WHERE cover_path = ?', ('',), 'idx_songs_cover_path'),
+    ]),
+
+    # Artist / album browse views
+    Migration(7, aggregate_statements('artists', 'artist') + aggregate_statements('albums', 'album'), plan_checks=[
+        ('SELECT * FROM artists ORDER BY name', (), 'NOT USE TEMP B-TREE'),
+        ('SELECT * FROM albums ORDER BY name', (), 'NOT USE TEMP B-TREE'),
+        ('UPDATE artists SET track_count = track_count - 1 WHERE name = ?', ('',), 'PRIMARY KEY'),
+        ('UPDATE albums SET track_count = track_count - 1 WHERE name = ?', ('',), 'PRIMARY KEY'),
+        ('SELECT cover_path FROM songs WHERE artist = ? AND cover_path IS NOT NULL LIMIT 1', ('',), 'idx_songs_artist'),
+        ('SELECT cover_path FROM songs WHERE album = ? AND cover_path IS NOT NULL LIMIT 1', ('',), 'idx_songs_album'),
+        ('SELECT * FROM songs WHERE album = ? ORDER BY title, id', ('',), 'idx_songs_album'),
+    ]),
+
+    # Download queue, restored on startup; partial_files is a JSON list
+    Migration(8, [
+        '''
+        CREATE TABLE IF NOT EXISTS download_groups (
+            id INTEGER PRIMARY KEY,
+            url TEXT,
+            title TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS downloads (
+            id INTEGER PRIMARY KEY,
+            group_id INTEGER REFERENCES download_groups(id) ON DELETE CASCADE,
+            url TEXT NOT NULL,
+            title TEXT,
+            priority INTEGER NOT NULL DEFAULT 0,
+            seq INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL,
+            audio_format TEXT NOT NULL DEFAULT 'mp3',
+            partial_files TEXT,
+            fetched_files TEXT,
+            library_files TEXT,
+            error TEXT
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_downloads_group ON downloads(group_id)',
+    ], plan_checks=[
+        ('SELECT 1 FROM downloads WHERE group_id = ?', (0,), 'idx_downloads_group'),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def get_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn):
+    current = get_version(conn)
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        # Another process may have applied it while we waited for the lock
+        if get_version(conn) >= migration.version:
+            conn.execute('ROLLBACK')
+            continue
+        try:
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {migration.version}')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        for failure in check_plans(conn, [migration]):
+            print(f"DB Plan Warning: {failure}")
+
+def check_plans(conn, migrations=None):
+    failures = []
+    for migration in migrations or MIGRATIONS:
+        for query, params, expected in migration.plan_checks:
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+            plan = ' | '.join(row[3] for row in rows)
+            if expected.startswith('NOT '):
+                ok = expected[4:] not in plan
+            else:
+                ok = expected in plan
+            if not ok:
+                failures.append(f"v{migration.version}: expected '{expected}' in plan of [{' '.join(query.split())}], got [{plan}]")
+    return failures
@@ -1,9 +1,11 @@
 import sys
-from PySide6.QtGui import QIcon, QPixmap, QAction
+from PySide6.QtGui import QIcon, QAction
 from PySide6.QtCore import Qt, QSize, Signal, QPoint
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QFrame, QLabel, QMenu
 
 from src.utils.config import Config
+from src.core.pixmap_cache import PixmapCache
+from src.core.image_loader import ImageLoader
 from src.ui.components.custom_slider import CustomSlider
 from src.ui.components.marquee_label import MarqueeLabel 
 
@@ -40,7 +42,7 @@ class CollapsedView(QWidget):
         self.album_art = QLabel()
         self.album_art.setFixedSize(40, 40)
         default_art_path = Config.get_icon_path("default_vinyl.png")
-        self.album_art.setPixmap(QPixmap(default_art_path).scaled(40, 40, Qt.KeepAspectRatio))
+        self.album_art.setPixmap(PixmapCache.instance().get(default_art_path, 40))
         self.album_art.setStyleSheet("background-color: #444; border-radius: 4px;")
         top_row.addWidget(self.album_art)
 
@@ -121,20 +123,18 @@ class CollapsedView(QWidget):
         menu.addAction(quit_action)
         menu.exec(pos)
 
-    def update_song_info(self, song_data):
+    def update_song_info(self, song):
         self.slider.setValue(0)
-        self.lbl_title.setText(song_data.get('title', 'Unknown Title'))
-        self.lbl_artist.setText(song_data.get('artist', 'Unknown Artist'))
-        
-        cover_path = song_data.get('cover_path')
-        if cover_path:
-            pixmap = QPixmap(cover_path)
-            if not pixmap.isNull():
-                self.album_art.setPixmap(pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                return
+        self.lbl_title.setText(song.title or 'Unknown Title')
+        self.lbl_artist.setText(song.artist or 'Unknown Artist')
         
         default_art_path = Config.get_icon_path("default_vinyl.png")
-        self.album_art.setPixmap(QPixmap(default_art_path).scaled(40, 40, Qt.KeepAspectRatio))
+        self.album_art.setPixmap(PixmapCache.instance().get(default_art_path, 40))
+        ImageLoader.instance().load_cover(self, song.cover_path, 40, self.set_album_art)
+
+    def set_album_art(self, pixmap):
+        if not pixmap.isNull():
+            self.album_art.setPixmap(pixmap)
 
     def set_playing_state(self, is_playing):
         icon_name = "pause.svg" if is_playing else "play.svg"
@@ -0,0 +1,105 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QProgressBar, QFrame, QPushButton
+
+from src.core.download_manager import DownloadManager
+from src.core.download_task import TaskState
+from src.ui.components.download_item import DownloadItem
+
+class DownloadGroupItem(QFrame):
+    # A playlist in the queue: aggregate progress on top, its per-track
+    # DownloadItems in a collapsible list underneath
+    def __init__(self, group):
+        super().__init__()
+        self.group = group
+        self.manager = DownloadManager.instance()
+        self.setStyleSheet("""
+            DownloadGroupItem {
+                background-color: #2E3440;
+                border-radius: 6px;
+                border: 1px solid #3B4252;
+            }
+            QLabel { color: white; }
+            QProgressBar {
+                border: 1px solid #4C566A;
+                border-radius: 4px;
+                text-align: center;
+                background-color: #2E3440;
+            }
+            QProgressBar::chunk { background-color: #88C0D0; }
+            QPushButton { background: transparent; color: #D8DEE9; border: none; font-size: 14px; }
+            QPushButton:hover { color: #88C0D0; }
+        """)
+
+        self.init_ui()
+        self.group.changed.connect(self.update_summary)
+        self.update_summary()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.btn_expand = self.create_btn("▸", "Show tracks", self.toggle_expanded)
+        self.lbl_title = QLabel(self.group.title or 'Unknown Playlist')
+        self.lbl_title.setStyleSheet("font-weight: bold; color: #EBCB8B;")
+
+        self.lbl_status = QLabel()
+        self.lbl_status.setStyleSheet("color: #D8DEE9; font-size: 11px;")
+
+        self.btn_retry = self.create_btn("↻", "Retry failed tracks", lambda: self.manager.retry_failed(self.group))
+        self.btn_cancel = self.create_btn("✕", "Cancel remaining tracks", lambda: self.manager.cancel_group(self.group))
+
+        top_layout.addWidget(self.btn_expand)
+        top_layout.addWidget(self.lbl_title)
+        top_layout.addStretch()
+        top_layout.addWidget(self.lbl_status)
+        top_layout.addWidget(self.btn_retry)
+        top_layout.addWidget(self.btn_cancel)
+        layout.addLayout(top_layout)
+
+        self.pbar = QProgressBar()
+        self.pbar.setRange(0, 100)
+        self.pbar.setFixedHeight(10)
+        self.pbar.setTextVisible(False)
+        layout.addWidget(self.pbar)
+
+        self.track_list = QWidget()
+        self.track_layout = QVBoxLayout(self.track_list)
+        self.track_layout.setContentsMargins(10, 5, 0, 0)
+        self.track_layout.setSpacing(6)
+        self.track_list.hide()
+        layout.addWidget(self.track_list)
+
+    def create_btn(self, text, tooltip, slot):
+        btn = QPushButton(text)
+        btn.setToolTip(tooltip)
+        btn.setCursor(Qt.PointingHandCursor)
+        btn.setFixedSize(24, 24)
+        btn.clicked.connect(slot)
+        return btn
+
+    def add_task(self, task):
+        self.track_layout.addWidget(DownloadItem(task))
+
+    def toggle_expanded(self):
+        expanded = not self.track_list.isVisible()
+        self.track_list.setVisible(expanded)
+        self.btn_expand.setText("▾" if expanded else "▸")
+        self.btn_expand.setToolTip("Hide tracks" if expanded else "Show tracks")
+
+    def update_summary(self):
+        total = len(self.group.tasks)
+        done = self.group.count(TaskState.COMPLETED)
+        failed = self.group.count(TaskState.FAILED)
+        active = self.group.count(TaskState.DOWNLOADING, TaskState.PROCESSING)
+        unfinished = total - done - failed - self.group.count(TaskState.CANCELLED)
+
+        parts = [f"{done}/{total} tracks"]
+        if active:
+            parts.append(f"{active} active")
+        if failed:
+            parts.append(f"{failed} failed")
+        self.lbl_status.setText(" · ".join(parts))
+        self.pbar.setValue(int(self.group.percent()))
+
+        self.btn_retry.setVisible(failed > 0)
+        self.btn_cancel.setVisible(unfinished > 0)
@@ -1,10 +1,25 @@
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QProgressBar, QFrame
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QProgressBar, QFrame, QPushButton
+
+from src.core.download_manager import DownloadManager
+from src.core.download_task import TaskState
 
 class DownloadItem(QFrame):
-    def __init__(self, worker):
+    STATES = {
+        # state: (label, colour)
+        TaskState.WAITING: ("Waiting", "#81A1C1"),
+        TaskState.DOWNLOADING: ("Downloading...", "#EBCB8B"),
+        TaskState.PROCESSING: ("Converting...", "#B48EAD"),
+        TaskState.PAUSED: ("Paused", "#D8DEE9"),
+        TaskState.COMPLETED: ("Completed", "#A3BE8C"),
+        TaskState.FAILED: ("Error", "#BF616A"),
+        TaskState.CANCELLED: ("Cancelled", "#666"),
+    }
+
+    def __init__(self, task):
         super().__init__()
-        self.worker = worker
+        self.task = task
+        self.manager = DownloadManager.instance()
         self.setFixedHeight(70)
         self.setStyleSheet("""
             DownloadItem {
@@ -20,27 +35,35 @@ class DownloadItem(QFrame):
                 background-color: #2E3440;
             }
             QProgressBar::chunk { background-color: #88C0D0; }
+            QPushButton { background: transparent; color: #D8DEE9; border: none; font-size: 14px; }
+            QPushButton:hover { color: #88C0D0; }
         """)
-        
+
         self.init_ui()
-        self.connect_worker()
+        self.connect_task()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignVCenter)
-        
+
         top_layout = QHBoxLayout()
-        self.lbl_title = QLabel(getattr(self.worker, 'video_title', 'Unknown Download'))
+        self.lbl_title = QLabel(self.task.title or 'Unknown Download')
         self.lbl_title.setStyleSheet("font-weight: bold;")
-        
-        self.lbl_status = QLabel("Starting...")
-        self.lbl_status.setStyleSheet("color: #EBCB8B; font-size: 11px;")
-        
+
+        self.lbl_status = QLabel()
+
+        self.btn_front = self.create_btn("⤒", "Download next", lambda: self.manager.move_to_front(self.task))
+        self.btn_pause = self.create_btn("⏸", "Pause", self.toggle_pause)
+        self.btn_cancel = self.create_btn("✕", "Cancel", lambda: self.manager.cancel(self.task))
+
         top_layout.addWidget(self.lbl_title)
         top_layout.addStretch()
         top_layout.addWidget(self.lbl_status)
+        top_layout.addWidget(self.btn_front)
+        top_layout.addWidget(self.btn_pause)
+        top_layout.addWidget(self.btn_cancel)
         layout.addLayout(top_layout)
-        
+
         self.pbar = QProgressBar()
         self.pbar.setRange(0, 100)
         self.pbar.setValue(0)
@@ -48,27 +71,46 @@ class DownloadItem(QFrame):
         self.pbar.setTextVisible(False)
         layout.addWidget(self.pbar)
 
-    def connect_worker(self):
-        self.worker.progress.connect(self.update_progress)
-        self.worker.finished.connect(self.on_finished)
-        self.worker.error.connect(self.on_error)
+    def create_btn(self, text, tooltip, slot):
+        btn = QPushButton(text)
+        btn.setToolTip(tooltip)
+        btn.setCursor(Qt.PointingHandCursor)
+        btn.setFixedSize(24, 24)
+        btn.clicked.connect(slot)
+        return btn
+
+    def connect_task(self):
+        self.task.progress.connect(self.update_progress)
+        self.task.state_changed.connect(self.update_state)
+        self.update_state(self.task.state)
+
+    def toggle_pause(self):
+        if self.task.state in (TaskState.PAUSED, TaskState.FAILED):
+            self.manager.resume(self.task)
+        else:
+            self.manager.pause(self.task)
 
     def update_progress(self, progress_str):
+        if self.task.state == TaskState.PROCESSING:
+            self.lbl_status.setText(f"Converting... {progress_str}")
+            return
+        if self.task.state != TaskState.DOWNLOADING:
+            return
         self.lbl_status.setText(f"Downloading... {progress_str}")
-        
-        try:
-            clean_str = progress_str.split(']')[-1].strip().replace('%','')
-            val = float(clean_str)
-            self.pbar.setValue(int(val))
-        except:
-            pass
-
-    def on_finished(self, filename):
-        self.lbl_status.setText("Completed")
-        self.lbl_status.setStyleSheet("color: #A3BE8C;")
-        self.pbar.setValue(100)
-
-    def on_error(self, err):
-        self.lbl_status.setText("Error")
-        self.lbl_status.setStyleSheet("color: #BF616A;")
+        self.pbar.setValue(int(self.task.percent))
+
+    def update_state(self, state):
+        label, colour = self.STATES[state]
+        self.lbl_status.setText(label)
+        self.lbl_status.setStyleSheet(f"color: {colour}; font-size: 11px;")
+        if state in (TaskState.PROCESSING, TaskState.COMPLETED):
+            self.pbar.setValue(100)
 
+        finished = state in (TaskState.COMPLETED, TaskState.CANCELLED)
+        resumable = state in (TaskState.PAUSED, TaskState.FAILED)
+        self.btn_front.setVisible(state == TaskState.WAITING)
+        # Conversions are short and CPU-bound, so they can be cancelled but not paused
+        self.btn_pause.setVisible(not finished and state != TaskState.PROCESSING)
+        self.btn_pause.setText("▶" if resumable else "⏸")
+        self.btn_pause.setToolTip("Retry" if state == TaskState.FAILED else "Resume" if resumable else "Pause")
+        self.btn_cancel.setVisible(not finished)
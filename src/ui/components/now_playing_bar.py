@@ -1,9 +1,11 @@
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QIcon
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QWidget
 
 from src.utils.config import Config
 from src.core.player import RepeatMode
+from src.core.pixmap_cache import PixmapCache
+from src.core.image_loader import ImageLoader
 from src.ui.components.marquee_label import MarqueeLabel
 from src.ui.components.custom_slider import CustomSlider
 
@@ -123,14 +125,16 @@ class NowPlayingBar(QFrame):
         btn.setStyleSheet("background: transparent; border: none;")
         return btn
 
-    def update_info(self, song_data):
+    def update_info(self, song):
         self.seek_slider.setValue(0) 
-        self.lbl_title.setText(song_data.get('title', 'Unknown'))
-        self.lbl_artist.setText(song_data.get('artist', 'Unknown'))
-        if song_data.get('cover_path'):
-            self.lbl_art.setPixmap(QPixmap(song_data['cover_path']))
-        else:
-            self.lbl_art.setPixmap(QPixmap(Config.get_icon_path("default_vinyl.png")))
+        self.lbl_title.setText(song.title or 'Unknown')
+        self.lbl_artist.setText(song.artist or 'Unknown')
+        self.lbl_art.setPixmap(PixmapCache.instance().get(Config.get_icon_path("default_vinyl.png"), 60))
+        ImageLoader.instance().load_cover(self, song.cover_path, 60, self.set_art)
+
+    def set_art(self, pixmap):
+        if not pixmap.isNull():
+            self.lbl_art.setPixmap(pixmap)
 
     def set_playing(self, is_playing):
         icon = "pause.svg" if is_playing else "play.svg"
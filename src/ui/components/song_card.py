@@ -19,6 +19,7 @@ class ImageLoader(QThread):
 
 class SongCard(QFrame):
     download_clicked = Signal(str, str) 
+    playlist_download_clicked = Signal(str, str, list) # url, title, entries
 
     def __init__(self, video_data):
         super().__init__()
@@ -94,7 +95,10 @@ class SongCard(QFrame):
         self.btn_download.setText("Queued...")
         self.btn_download.setEnabled(False)
         url = self.video_data.get('webpage_url') or self.video_data.get('url')
-        self.download_clicked.emit(url, self.video_data['title'])
+        if self.video_data.get('entries'):
+            self.playlist_download_clicked.emit(url, self.video_data['title'], self.video_data['entries'])
+        else:
+            self.download_clicked.emit(url, self.video_data['title'])
     
     def update_status(self, text):
         self.btn_download.setText(text)
@@ -0,0 +1,278 @@
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QPoint, QRect, QSize
+from PySide6.QtGui import QColor, QFont, QIcon, QPainter, QPainterPath
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QFrame, QAbstractItemView
+
+from src.utils.config import Config
+from src.utils import list_diff
+from src.core.image_loader import ImageLoader
+
+class SongListModel(QAbstractListModel):
+    SongRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.songs = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.songs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        song = self.songs[index.row()]
+        if role == Qt.DisplayRole:
+            return song.title
+        if role == self.SongRole:
+            return song
+        return None
+
+    def set_songs(self, songs):
+        self.beginResetModel()
+        self.songs = list(songs)
+        self.endResetModel()
+
+    def set_view(self, view):
+        # `view` reads its rows from the library's sort index, so showing the
+        # library or switching its order copies nothing; the rows are the
+        # same songs rearranged, which Qt treats as a layout change
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        rows = [view.row_of(self.songs[index.row()].id) for index in old]
+        self.songs = view
+        self.changePersistentIndexList(old, [QModelIndex() if row is None else self.index(row) for row in rows])
+        self.layoutChanged.emit()
+
+    def detach(self):
+        # Editing rows by hand needs a list of our own
+        if not isinstance(self.songs, list):
+            self.songs = list(self.songs)
+
+    def append_songs(self, songs):
+        if not songs:
+            return
+        self.detach()
+        start = len(self.songs)
+        self.beginInsertRows(QModelIndex(), start, start + len(songs) - 1)
+        self.songs.extend(songs)
+        self.endInsertRows()
+
+    # With a view, `update` edits the index behind it between Qt's begin and
+    # end calls, in place of the list edit
+
+    def insert_song(self, row, song, update=None):
+        self.beginInsertRows(QModelIndex(), row, row)
+        if update is None:
+            self.detach()
+            self.songs.insert(row, song)
+        else:
+            update()
+        self.endInsertRows()
+
+    def remove_rows(self, row, count=1, update=None):
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        if update is None:
+            self.detach()
+            del self.songs[row:row + count]
+        else:
+            update()
+        self.endRemoveRows()
+
+    def move_row(self, source, destination, update):
+        # `destination` counts rows before the move, as beginMoveRows does
+        if destination in (source, source + 1):
+            update()
+            row = source
+        else:
+            self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination)
+            update()
+            self.endMoveRows()
+            row = destination - 1 if destination > source else destination
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+    def apply_songs(self, songs):
+        # Turn the current rows into `songs` with the fewest row operations, so
+        # scroll position, selection and painted thumbnails survive updates
+        songs = list(songs)
+        self.detach()
+        ops = list_diff.diff([s.id for s in self.songs], [s.id for s in songs],
+                             Config.LIST_DIFF_MAX_MOVES)
+        if ops is None:
+            self.set_songs(songs)
+            return
+        by_id = {s.id: s for s in songs}
+        for op in ops:
+            if op[0] == 'remove':
+                self.remove_rows(op[1], op[2])
+            elif op[0] == 'move':
+                source, destination = op[1], op[2]
+                # Qt wants the destination as a row of the list before the move
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(),
+                                   destination + 1 if destination > source else destination)
+                self.songs.insert(destination, self.songs.pop(source))
+                self.endMoveRows()
+            else:
+                row, ids = op[1], op[2]
+                self.beginInsertRows(QModelIndex(), row, row + len(ids) - 1)
+                self.songs[row:row] = [by_id[song_id] for song_id in ids]
+                self.endInsertRows()
+
+        # Songs come from the registry, so an edited row is a different object
+        changed = [row for row, song in enumerate(songs) if self.songs[row] is not song]
+        self.songs = songs
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+
+    def song_ids(self):
+        return [s.id for s in self.songs]
+
+    def row_of(self, song_id):
+        if not isinstance(self.songs, list):
+            return self.songs.row_of(song_id)
+        return next((i for i, s in enumerate(self.songs) if s.id == song_id), None)
+
+class SongItemDelegate(QStyledItemDelegate):
+    # One painted row: thumbnail, title, artist, duration and a play button,
+    # 60px high with 5px between rows
+    ROW_HEIGHT = 60
+    ROW_GAP = 5
+    THUMB_SIZE = 50
+    BUTTON_SIZE = 30
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.play_icon = QIcon(Config.get_icon_path("play.svg"))
+        self.title_font = QFont()
+        self.title_font.setPixelSize(13)
+        self.title_font.setBold(True)
+        self.artist_font = QFont()
+        self.artist_font.setPixelSize(11)
+        self.duration_font = QFont()
+        self.duration_font.setPixelSize(12)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.ROW_GAP)
+
+    def row_rect(self, rect):
+        return QRect(rect.left(), rect.top(), rect.width(), self.ROW_HEIGHT)
+
+    def play_rect(self, rect):
+        row = self.row_rect(rect)
+        return QRect(row.right() - 5 - self.BUTTON_SIZE + 1, row.top() + (self.ROW_HEIGHT - self.BUTTON_SIZE) // 2,
+                     self.BUTTON_SIZE, self.BUTTON_SIZE)
+
+    def paint(self, painter, option, index):
+        song = index.data(SongListModel.SongRole)
+        row = self.row_rect(option.rect)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+
+        if option.state & QStyle.State_Selected:
+            painter.setBrush(QColor("#3B4252"))
+            painter.drawRoundedRect(row, 6, 6)
+        elif option.state & QStyle.State_MouseOver:
+            painter.setBrush(QColor("#2E3440"))
+            painter.drawRoundedRect(row, 6, 6)
+
+        # Thumbnail, or the plain placeholder until the decoder delivers
+        thumb_rect = QRect(row.left() + 5, row.top() + 5, self.THUMB_SIZE, self.THUMB_SIZE)
+        clip = QPainterPath()
+        clip.addRoundedRect(thumb_rect, 4, 4)
+        pixmap = ImageLoader.instance().fetch_cover(self.view, song.cover_path, self.THUMB_SIZE,
+                                                    self.view.on_thumbnail_ready)
+        if pixmap is not None and not pixmap.isNull():
+            painter.setClipPath(clip)
+            painter.drawPixmap(thumb_rect, pixmap)
+            painter.setClipping(False)
+        else:
+            painter.fillPath(clip, QColor("#444"))
+
+        play_rect = self.play_rect(option.rect)
+        self.play_icon.paint(painter, play_rect.adjusted(7, 7, -7, -7))
+
+        mins, secs = divmod(song.duration or 0, 60)
+        duration = f"{mins}:{secs:02d}"
+        painter.setFont(self.duration_font)
+        duration_width = painter.fontMetrics().horizontalAdvance(duration)
+        duration_rect = QRect(play_rect.left() - 15 - duration_width, row.top(), duration_width, self.ROW_HEIGHT)
+        painter.setPen(QColor("#666"))
+        painter.drawText(duration_rect, Qt.AlignVCenter | Qt.AlignLeft, duration)
+
+        text_left = thumb_rect.right() + 16
+        text_width = max(0, duration_rect.left() - 15 - text_left)
+        painter.setFont(self.title_font)
+        title_height = painter.fontMetrics().height()
+        title = painter.fontMetrics().elidedText(song.title or 'Unknown', Qt.ElideRight, text_width)
+        painter.setFont(self.artist_font)
+        artist_height = painter.fontMetrics().height()
+        artist = painter.fontMetrics().elidedText(song.artist or 'Unknown Artist', Qt.ElideRight, text_width)
+
+        top = row.top() + (self.ROW_HEIGHT - title_height - 2 - artist_height) // 2
+        painter.setFont(self.title_font)
+        painter.setPen(QColor("white"))
+        painter.drawText(QRect(text_left, top, text_width, title_height), Qt.AlignLeft | Qt.AlignVCenter, title)
+        painter.setFont(self.artist_font)
+        painter.setPen(QColor("#88C0D0"))
+        painter.drawText(QRect(text_left, top + title_height + 2, text_width, artist_height),
+                         Qt.AlignLeft | Qt.AlignVCenter, artist)
+        painter.restore()
+
+class SongListView(QListView):
+    # Only the visible rows are ever painted, so memory and build time stay
+    # flat no matter how many songs the model holds
+    play_clicked = Signal(int) # song id
+    context_menu_requested = Signal(int, QPoint)
+
+    def __init__(self, model=None, parent=None):
+        super().__init__(parent)
+        self.setModel(model or SongListModel(self))
+        self.delegate = SongItemDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }")
+
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.on_context_menu)
+        # Thumbnails queued for rows scrolled out of view are dropped; the
+        # next paint asks again for whatever is visible now
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
+    def song_at(self, pos):
+        index = self.indexAt(pos)
+        return index.data(SongListModel.SongRole) if index.isValid() else None
+
+    def on_play_button(self, pos):
+        index = self.indexAt(pos)
+        return index.isValid() and self.delegate.play_rect(self.visualRect(index)).contains(pos)
+
+    def mouseMoveEvent(self, event):
+        if self.on_play_button(event.position().toPoint()):
+            self.viewport().setCursor(Qt.PointingHandCursor)
+        else:
+            self.viewport().unsetCursor()
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        pos = event.position().toPoint()
+        if event.button() == Qt.LeftButton and self.on_play_button(pos):
+            self.play_clicked.emit(self.song_at(pos).id)
+        super().mouseReleaseEvent(event)
+
+    def on_context_menu(self, pos):
+        song = self.song_at(pos)
+        if song is not None:
+            self.context_menu_requested.emit(song.id, self.viewport().mapToGlobal(pos))
+
+    def on_scrolled(self):
+        ImageLoader.instance().cancel(self)
+
+    def on_thumbnail_ready(self, pixmap):
+        if not pixmap.isNull():
+            self.viewport().update()
@@ -2,12 +2,13 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QMenu, QInputDialog, QMessageBox
 
 from src.database.db_manager import DBManager
+from src.core.song import SongRegistry
 from src.utils.events import global_event_bus
 from src.ui.dialogs.edit_metadata_dialog import EditMetadataDialog
 
 class SongContextMenu:
     @staticmethod
-    def show(parent, song_data, global_pos, item_widget=None):
+    def show(parent, song_id, global_pos, item_widget=None):
         menu = QMenu(parent)
         menu.setStyleSheet("""
             QMenu { background-color: #25262B; border: 1px solid #3E4045; padding: 5px; }
@@ -15,28 +16,35 @@ class SongContextMenu:
             QMenu::item:selected { background-color: #88C0D0; color: black; }
         """)
 
+        menu.addAction("Play Next").triggered.connect(lambda: global_event_bus.play_next_requested.emit(song_id))
+        menu.addAction("Add to Queue").triggered.connect(lambda: global_event_bus.queue_append_requested.emit(song_id))
+        menu.addSeparator()
+
         add_to_playlist = menu.addMenu("Add to Playlist")
         db = DBManager()
         playlists = db.get_playlists()
         new_pl_action = add_to_playlist.addAction("+ New Playlist")
-        new_pl_action.triggered.connect(lambda: SongContextMenu.create_and_add(parent, song_data))
+        new_pl_action.triggered.connect(lambda: SongContextMenu.create_and_add(parent, song_id))
         add_to_playlist.addSeparator()
         for pl in playlists:
             action = add_to_playlist.addAction(f"{pl['name']} ({pl['song_count']})")
-            action.triggered.connect(lambda checked=False, pid=pl['id']: SongContextMenu.add_to_existing(pid, song_data))
+            action.triggered.connect(lambda checked=False, pid=pl['id']: SongContextMenu.add_to_existing(pid, song_id))
         
         menu.addSeparator()
         edit_action = menu.addAction("Edit Info")
-        edit_action.triggered.connect(lambda: SongContextMenu.open_edit_dialog(parent, song_data))
+        edit_action.triggered.connect(lambda: SongContextMenu.open_edit_dialog(parent, song_id))
         menu.exec(global_pos)
 
     @staticmethod
-    def open_edit_dialog(parent, song_data):
-        dialog = EditMetadataDialog(song_data, parent)
+    def open_edit_dialog(parent, song_id):
+        song = SongRegistry.instance().get(song_id)
+        if song is None:
+            return
+        dialog = EditMetadataDialog(song, parent)
         dialog.exec()
     
     @staticmethod
-    def create_and_add(parent, song_data):
+    def create_and_add(parent, song_id):
         name, ok = QInputDialog.getText(parent, "New Playlist", "Playlist Name:")
         if ok and name:
             db = DBManager()
@@ -46,15 +54,15 @@ class SongContextMenu:
                 playlists = db.get_playlists()
                 for p in playlists:
                     if p['name'] == name:
-                        SongContextMenu.add_to_existing(p['id'], song_data)
+                        SongContextMenu.add_to_existing(p['id'], song_id)
                         break
             else:
                 QMessageBox.warning(parent, "Error", "Playlist name already exists!")
 
     @staticmethod
-    def add_to_existing(playlist_id, song_data):
+    def add_to_existing(playlist_id, song_id):
         db = DBManager()
-        db.add_to_playlist(playlist_id, song_data['filepath'])
+        db.add_to_playlist(playlist_id, song_id)
         global_event_bus.playlists_updated.emit()
         global_event_bus.playlist_content_changed.emit(playlist_id)
 
@@ -1,17 +1,18 @@
 import os
 import re
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QFileDialog, QMessageBox, QFrame
 
-from src.database.db_manager import DBManager
-from src.utils.events import global_event_bus
+from src.core.library_manager import LibraryManager
+from src.core.cover_cache import CoverCache
+from src.core.thumbnails import ThumbnailService
+from src.core.image_loader import ImageLoader
 from src.core.metadata_editor import MetadataEditor
 
 class EditMetadataDialog(QDialog):
-    def __init__(self, song_data, parent=None):
+    def __init__(self, song, parent=None):
         super().__init__(parent)
-        self.song_data = song_data
+        self.song = song
         self.new_cover_path = None
         self.setWindowTitle("Edit Song Info")
         self.setFixedSize(400, 500)
@@ -39,10 +40,8 @@ class EditMetadataDialog(QDialog):
         self.lbl_cover.setCursor(Qt.PointingHandCursor)
         self.lbl_cover.mousePressEvent = self.browse_image
         
-        if self.song_data.get('cover_path'):
-            self.lbl_cover.setPixmap(QPixmap(self.song_data['cover_path']))
-        else:
-            self.lbl_cover.setText("Click to Change\nCover Art")
+        self.lbl_cover.setText("Click to Change\nCover Art")
+        ImageLoader.instance().load_cover(self, self.song.cover_path, 160, self.set_cover)
 
         img_layout.addWidget(self.lbl_cover, alignment=Qt.AlignCenter)
         img_hint = QLabel("(Click image to change)")
@@ -50,13 +49,13 @@ class EditMetadataDialog(QDialog):
         img_layout.addWidget(img_hint, alignment=Qt.AlignCenter)
         layout.addLayout(img_layout)
 
-        self.input_title = QLineEdit(self.song_data.get('title', ''))
+        self.input_title = QLineEdit(self.song.title or '')
         self.input_title.setPlaceholderText("Song Title")
         
-        self.input_artist = QLineEdit(self.song_data.get('artist', ''))
+        self.input_artist = QLineEdit(self.song.artist or '')
         self.input_artist.setPlaceholderText("Artist Name")
         
-        self.input_album = QLineEdit(self.song_data.get('album', ''))
+        self.input_album = QLineEdit(self.song.album or '')
         self.input_album.setPlaceholderText("Album Name")
         
         layout.addWidget(self.input_title)
@@ -82,7 +81,11 @@ class EditMetadataDialog(QDialog):
         path, _ = QFileDialog.getOpenFileName(self, "Select Cover Art", "", "Images (*.png *.jpg *.jpeg)")
         if path:
             self.new_cover_path = path
-            self.lbl_cover.setPixmap(QPixmap(path))
+            ImageLoader.instance().load(self, path, 160, self.set_cover)
+
+    def set_cover(self, pixmap):
+        if not pixmap.isNull():
+            self.lbl_cover.setPixmap(pixmap)
 
     def sanitize_filename(self, name):
         return re.sub(r'[<>:"/\\|?*]', '', name).strip()
@@ -96,7 +99,7 @@ class EditMetadataDialog(QDialog):
             QMessageBox.warning(self, "Error", "Title cannot be empty")
             return
 
-        current_path = self.song_data['filepath']
+        current_path = self.song.filepath
         dir_name = os.path.dirname(current_path)
         ext = os.path.splitext(current_path)[1]
         
@@ -123,11 +126,14 @@ class EditMetadataDialog(QDialog):
                 QMessageBox.warning(self, "Rename Failed", f"Could not rename file. Is it playing?\nTags were saved, but filename remains.\nError: {e}")
                 final_path = current_path
 
-        db = DBManager()
-        final_cover = self.new_cover_path if self.new_cover_path else self.song_data.get('cover_path')
-        
-        db.update_song_metadata(self.song_data['id'], title, artist, album, final_cover, final_path)
+        final_cover = self.song.cover_path
+        if self.new_cover_path:
+            try:
+                final_cover = CoverCache.store_file(self.new_cover_path)
+                ThumbnailService.instance().request(final_cover)
+            except OSError as e:
+                print(f"Error caching cover art: {e}")
         
-        global_event_bus.library_updated.emit()
+        LibraryManager.instance().update_song_metadata(self.song.id, title, artist, album, final_cover, final_path)
         self.accept()
 
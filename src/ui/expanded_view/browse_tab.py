@@ -0,0 +1,213 @@
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QRect, QSize
+from PySide6.QtGui import QColor, QFont, QPainter, QPainterPath
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListView, QStackedWidget,
+                               QStyledItemDelegate, QStyle, QFrame, QAbstractItemView, QButtonGroup)
+
+from src.utils.config import Config
+from src.database.db_manager import DBManager
+from src.core.library_manager import LibraryManager
+from src.core.image_loader import ImageLoader
+from src.core.pixmap_cache import PixmapCache
+from src.ui.components.song_list_view import SongListView
+from src.ui.context_menus import SongContextMenu
+
+class GroupListModel(QAbstractListModel):
+    # Rows of the artists/albums aggregate tables
+    GroupRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.groups = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.groups)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        group = self.groups[index.row()]
+        if role == Qt.DisplayRole:
+            return group['name']
+        if role == self.GroupRole:
+            return group
+        return None
+
+    def set_groups(self, groups):
+        self.beginResetModel()
+        self.groups = groups
+        self.endResetModel()
+
+class GroupCardDelegate(QStyledItemDelegate):
+    CARD_SIZE = QSize(170, 215)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.name_font = QFont()
+        self.name_font.setPixelSize(13)
+        self.name_font.setBold(True)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(11)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def paint(self, painter, option, index):
+        group = index.data(GroupListModel.GroupRole)
+        rect = option.rect.adjusted(5, 5, -5, -5)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#3B4252" if option.state & QStyle.State_MouseOver else "#2E3440"))
+        painter.drawRoundedRect(rect, 10, 10)
+
+        side = rect.width() - 20
+        cover_rect = QRect(rect.left() + 10, rect.top() + 10, side, side)
+        clip = QPainterPath()
+        clip.addRoundedRect(cover_rect, 6, 6)
+        pixmap = ImageLoader.instance().fetch_cover(self.view, group.get('cover_path'), 160, self.view.on_cover_ready)
+        if pixmap is None or pixmap.isNull():
+            pixmap = PixmapCache.instance().get(Config.get_icon_path("default_vinyl.png"), 160)
+        painter.setClipPath(clip)
+        painter.drawPixmap(cover_rect, pixmap)
+        painter.setClipping(False)
+
+        text_rect = QRect(rect.left() + 8, cover_rect.bottom() + 8, rect.width() - 16, 18)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("white"))
+        name = painter.fontMetrics().elidedText(group['name'], Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        hours, rest = divmod(group['total_duration'], 3600)
+        length = f"{hours}h {rest // 60}m" if hours else f"{rest // 60}m"
+        tracks = f"{group['track_count']} song" + ("" if group['track_count'] == 1 else "s")
+        painter.setFont(self.info_font)
+        painter.setPen(QColor("#88C0D0"))
+        painter.drawText(text_rect.translated(0, 18), Qt.AlignLeft | Qt.AlignVCenter, f"{tracks} · {length}")
+        painter.restore()
+
+class GroupGridView(QListView):
+    group_clicked = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(GroupListModel(self))
+        self.setItemDelegate(GroupCardDelegate(self))
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }")
+        self.clicked.connect(lambda index: self.group_clicked.emit(index.data(GroupListModel.GroupRole)))
+        self.verticalScrollBar().valueChanged.connect(lambda: ImageLoader.instance().cancel(self))
+
+    def on_cover_ready(self, pixmap):
+        if not pixmap.isNull():
+            self.viewport().update()
+
+class BrowseTab(QWidget):
+    play_requested = Signal(list, int, bool)
+
+    def __init__(self):
+        super().__init__()
+        self.db = DBManager()
+        self.mode = 'artists'
+        self.group = None
+        self.init_ui()
+        LibraryManager.instance().songs_updated.connect(self.on_songs_updated)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        header = QHBoxLayout()
+        self.btn_back = QPushButton("← Back")
+        self.btn_back.setCursor(Qt.PointingHandCursor)
+        self.btn_back.setStyleSheet("background-color: #3B4252; color: white; border-radius: 4px; padding: 5px 10px;")
+        self.btn_back.clicked.connect(self.show_groups)
+        self.btn_back.hide()
+
+        self.lbl_title = QLabel("Browse")
+        self.lbl_title.setStyleSheet("font-size: 24px; font-weight: bold; color: white;")
+
+        toggle_style = """
+            QPushButton { background-color: #3B4252; color: white; border-radius: 15px; padding: 5px 15px; border: 1px solid #4C566A; }
+            QPushButton:checked { background-color: #88C0D0; color: #2E3440; font-weight: bold; }
+        """
+        self.mode_buttons = QButtonGroup(self)
+        header.addWidget(self.btn_back)
+        header.addWidget(self.lbl_title)
+        header.addStretch()
+        for mode, label in (('artists', "Artists"), ('albums', "Albums")):
+            btn = QPushButton(label)
+            btn.setCheckable(True)
+            btn.setChecked(mode == self.mode)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setStyleSheet(toggle_style)
+            btn.clicked.connect(lambda checked=False, m=mode: self.set_mode(m))
+            self.mode_buttons.addButton(btn)
+            header.addWidget(btn)
+        layout.addLayout(header)
+
+        self.stack = QStackedWidget()
+        self.grid = GroupGridView()
+        self.grid.group_clicked.connect(self.open_group)
+        self.song_list = SongListView()
+        self.song_list.play_clicked.connect(self.on_song_play)
+        self.song_list.context_menu_requested.connect(lambda song_id, pos: SongContextMenu.show(self, song_id, pos))
+        self.stack.addWidget(self.grid)
+        self.stack.addWidget(self.song_list)
+        layout.addWidget(self.stack)
+
+    def showEvent(self, event):
+        # One indexed read of a small aggregate table; cheap enough to redo on
+        # every visit so counts follow library changes
+        super().showEvent(event)
+        if self.stack.currentWidget() is self.grid:
+            self.load_groups()
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.show_groups()
+
+    def load_groups(self):
+        groups = self.db.get_artists() if self.mode == 'artists' else self.db.get_albums()
+        self.grid.model().set_groups(groups)
+
+    def show_groups(self):
+        self.lbl_title.setText("Browse")
+        self.btn_back.hide()
+        self.stack.setCurrentWidget(self.grid)
+        self.load_groups()
+
+    def group_songs(self, group):
+        if self.mode == 'artists':
+            return self.db.get_songs_by_artist(group['name'])
+        return self.db.get_songs_by_album(group['name'])
+
+    def open_group(self, group):
+        self.group = group
+        self.song_list.model().set_songs(self.group_songs(group))
+        self.lbl_title.setText(group['name'])
+        self.btn_back.show()
+        self.stack.setCurrentWidget(self.song_list)
+
+    def on_songs_updated(self, songs):
+        # Edits can rename a group or move a song out of the open one
+        if self.stack.currentWidget() is self.grid:
+            self.load_groups()
+        elif self.group is not None:
+            self.song_list.model().apply_songs(self.group_songs(self.group))
+
+    def on_song_play(self, song_id):
+        model = self.song_list.model()
+        index = model.row_of(song_id)
+        if index is not None:
+            self.play_requested.emit(model.song_ids(), index, False)
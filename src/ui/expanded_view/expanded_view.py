@@ -6,6 +6,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QS
 from src.ui.expanded_view.queue_tab import QueueTab
 from src.ui.expanded_view.search_tab import SearchTab
 from src.ui.expanded_view.library_tab import LibraryTab
+from src.ui.expanded_view.browse_tab import BrowseTab
 from src.ui.expanded_view.settings_tab import SettingsTab
 from src.ui.components.now_playing_bar import NowPlayingBar
 from src.ui.expanded_view.playlists_tab import PlaylistsTab
@@ -55,11 +56,13 @@ class ExpandedView(QWidget):
         
         self.btn_search = self.create_sidebar_btn("Search and Download")
         self.btn_library = self.create_sidebar_btn("My Library")
+        self.btn_browse = self.create_sidebar_btn("Artists & Albums")
         self.btn_playlists = self.create_sidebar_btn("Playlists")
         self.btn_queue = self.create_sidebar_btn("Download Queue")
         
         sidebar_layout.addWidget(self.btn_search)
         sidebar_layout.addWidget(self.btn_library)
+        sidebar_layout.addWidget(self.btn_browse)
         sidebar_layout.addWidget(self.btn_playlists)
         sidebar_layout.addWidget(self.btn_queue)
         sidebar_layout.addStretch()
@@ -87,12 +90,14 @@ class ExpandedView(QWidget):
         
         self.search_tab = SearchTab()
         self.library_tab = LibraryTab()
+        self.browse_tab = BrowseTab()
         self.playlists_tab = PlaylistsTab()
         self.queue_tab = QueueTab()             
         self.settings_tab = SettingsTab(self.app) 
         
         self.pages.addWidget(self.search_tab)
         self.pages.addWidget(self.library_tab)
+        self.pages.addWidget(self.browse_tab)
         self.pages.addWidget(self.playlists_tab)
         self.pages.addWidget(self.queue_tab)
         self.pages.addWidget(self.settings_tab)
@@ -104,9 +109,10 @@ class ExpandedView(QWidget):
 
         self.btn_search.clicked.connect(lambda: self.pages.setCurrentIndex(0))
         self.btn_library.clicked.connect(lambda: self.pages.setCurrentIndex(1))
-        self.btn_playlists.clicked.connect(lambda: self.pages.setCurrentIndex(2))
-        self.btn_queue.clicked.connect(lambda: self.pages.setCurrentIndex(3))
-        self.btn_settings.clicked.connect(lambda: self.pages.setCurrentIndex(4))
+        self.btn_browse.clicked.connect(lambda: self.pages.setCurrentIndex(2))
+        self.btn_playlists.clicked.connect(lambda: self.pages.setCurrentIndex(3))
+        self.btn_queue.clicked.connect(lambda: self.pages.setCurrentIndex(4))
+        self.btn_settings.clicked.connect(lambda: self.pages.setCurrentIndex(5))
         
         main_layout.addWidget(self.sidebar, 0) 
         main_layout.addWidget(self.content_area, 1)
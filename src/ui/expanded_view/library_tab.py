@@ -1,18 +1,24 @@
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QLabel, QFrame, QPushButton, QLineEdit
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox
 
 from src.core.player import Player
 from src.core.library_manager import LibraryManager
-from src.ui.components.library_item import LibraryItem
+from src.core.library_filter import LibraryFilter
+from src.core.library_sort import LibrarySort
+from src.database.db_manager import DBManager
+from src.ui.components.song_list_view import SongListView
+from src.ui.context_menus import SongContextMenu
 
 class LibraryTab(QWidget):
     play_requested = Signal(list, int, bool)
 
     def __init__(self):
         super().__init__()
-        self.manager = LibraryManager()
-        self.all_songs = []
-        self.current_song_list = []
+        self.manager = LibraryManager.instance()
+        self.db = DBManager()
+        self.library_filter = LibraryFilter(self.db, self)
+        self.library_filter.results_ready.connect(self.populate_list)
+        self.library_sort = LibrarySort()
         self.init_ui()
         self.load_library()
 
@@ -51,6 +57,21 @@ class LibraryTab(QWidget):
         """)
         btn_rescan.clicked.connect(self.refresh_library)
 
+        self.sort_combo = QComboBox()
+        self.sort_combo.setCursor(Qt.PointingHandCursor)
+        self.sort_combo.setStyleSheet("""
+            QComboBox { background-color: #3B4252; color: white; border-radius: 15px; padding: 5px 15px; border: 1px solid #4C566A; }
+            QComboBox:hover { border-color: #88C0D0; }
+            QComboBox::drop-down { border: none; }
+            QComboBox QAbstractItemView { background-color: #3B4252; color: white; selection-background-color: #88C0D0; }
+        """)
+        for name, (label, _) in LibrarySort.ORDERS.items():
+            self.sort_combo.addItem(label, name)
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_changed)
+
+        self.lbl_scan_status = QLabel("")
+        self.lbl_scan_status.setStyleSheet("color: #666; font-size: 11px;")
+
         btn_play_all = QPushButton("▶ Play All")
         btn_play_all.setCursor(Qt.PointingHandCursor)
         btn_play_all.setStyleSheet("""
@@ -69,75 +90,161 @@ class LibraryTab(QWidget):
 
         header_layout.addWidget(lbl_header)
         header_layout.addStretch()
+        header_layout.addWidget(self.lbl_scan_status)
         header_layout.addWidget(self.search_bar)
+        header_layout.addWidget(self.sort_combo)
         header_layout.addWidget(btn_rescan)
         header_layout.addWidget(btn_play_all)
         header_layout.addWidget(btn_shuffle)
         layout.addLayout(header_layout)
 
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        
-        self.list_container = QWidget()
-        self.list_container.setStyleSheet("background: transparent;")
-        self.list_layout = QVBoxLayout(self.list_container)
-        self.list_layout.setAlignment(Qt.AlignTop)
-        self.list_layout.setSpacing(5)
-        
-        self.scroll.setWidget(self.list_container)
-        layout.addWidget(self.scroll)
+        self.lbl_empty = QLabel("", alignment=Qt.AlignCenter)
+        self.lbl_empty.hide()
+        layout.addWidget(self.lbl_empty)
+
+        self.song_list = SongListView()
+        self.song_list.play_clicked.connect(self.on_item_play)
+        self.song_list.context_menu_requested.connect(self.show_song_context_menu)
+        self.model = self.song_list.model()
+        layout.addWidget(self.song_list)
+
+    @property
+    def current_song_list(self):
+        return self.model.songs
 
     def load_library(self):
-        self.manager.library_changed.connect(self.on_library_loaded)
+        self.manager.library_reset.connect(self.on_library_reset)
+        self.manager.library_page.connect(self.on_library_page)
+        self.manager.library_loaded.connect(self.on_library_loaded)
+        self.manager.scan_report.connect(self.on_scan_report)
+        self.manager.songs_added.connect(self.on_songs_added)
+        self.manager.songs_updated.connect(self.on_songs_updated)
+        self.manager.songs_removed.connect(self.on_songs_removed)
         self.manager.load_library()
+        self.refresh_library()
 
     def refresh_library(self):
+        self.lbl_scan_status.setText("Scanning...")
         self.manager.refresh_library()
 
-    def on_library_loaded(self, songs):
-        self.all_songs = songs
-        self.filter_library(self.search_bar.text())
+    def on_scan_report(self, added, updated, removed):
+        self.lbl_scan_status.setText(f"+{added} added, {updated} updated, {removed} removed")
+
+    def on_library_reset(self):
+        # Empty the list while its view still has the old songs to remove
+        if not self.search_bar.text().strip():
+            self.populate_list([])
+        self.library_sort.load([])
+
+    def on_library_page(self, songs):
+        # Pages arrive in database title order; show them straight away and
+        # settle into the chosen order once everything is in
+        self.library_sort.extend(songs)
+        if not self.search_bar.text().strip():
+            self.append_items(songs)
+
+    def on_library_loaded(self):
+        if self.search_bar.text().strip():
+            self.library_filter.refresh()
+        else:
+            self.show_library()
+        # Sort the other orders in the background so switching is a swap
+        self.library_sort.prebuild()
+
+    def show_library(self):
+        if self.manager.pages is None:
+            self.model.set_view(self.library_sort.view())
+            self.update_empty_label()
+        else:
+            # Pages still to come are appended, so this needs a list
+            self.populate_list(self.library_sort.view())
+
+    def on_sort_changed(self):
+        self.library_sort.set_order(self.sort_combo.currentData())
+        if not self.search_bar.text().strip() and self.manager.pages is None:
+            self.model.set_view(self.library_sort.view())
+            self.song_list.scrollToTop()
+
+    def on_songs_removed(self, song_ids):
+        removed = set(song_ids)
+        self.library_filter.invalidate(removed)
+        query_active = bool(self.search_bar.text().strip())
+        for song_id in removed:
+            if query_active:
+                self.library_sort.remove(song_id)
+            elif song_id in self.library_sort.songs:
+                self.model.remove_rows(self.library_sort.row_of(song_id),
+                                       update=lambda: self.library_sort.remove(song_id))
+        if query_active:
+            self.library_filter.refresh()
+        else:
+            self.update_empty_label()
+
+    def on_songs_updated(self, songs):
+        # An edit can move the song; move its row rather than re-insert it,
+        # so it keeps its selection
+        self.library_filter.invalidate(s.id for s in songs)
+        query_active = bool(self.search_bar.text().strip())
+        for song in songs:
+            if query_active or song.id not in self.library_sort.songs:
+                self.library_sort.update(song)
+            else:
+                # The insertion point is counted with the old entry still in
+                # place, which is how Qt counts a move destination
+                self.model.move_row(self.library_sort.row_of(song.id), self.library_sort.insertion_row(song),
+                                    lambda: self.library_sort.update(song))
+        if query_active:
+            self.library_filter.refresh()
+
+    def on_songs_added(self, songs):
+        query_active = bool(self.search_bar.text().strip())
+        if not query_active and not self.current_song_list:
+            self.lbl_empty.hide()
+        for song in songs:
+            if query_active:
+                self.library_sort.add(song)
+            else:
+                self.model.insert_song(self.library_sort.insertion_row(song), song,
+                                       update=lambda: self.library_sort.add(song))
+        if query_active:
+            self.library_filter.refresh()
 
     def filter_library(self, text):
-        query = text.lower().strip()
-        
-        if not query:
-            filtered_songs = self.all_songs
+        # Clearing the box is instant; typing is debounced by the filter
+        if not text.strip():
+            self.library_filter.cancel()
+            self.show_library()
         else:
-            filtered_songs = [
-                s for s in self.all_songs 
-                if query in s.get('title', '').lower() 
-                or query in s.get('artist', '').lower()
-            ]
-        
-        self.populate_list(filtered_songs)
+            self.library_filter.set_query(text)
 
     def populate_list(self, songs):
-        for i in range(self.list_layout.count()):
-            child = self.list_layout.itemAt(i).widget()
-            if child: child.deleteLater()
+        self.model.apply_songs(songs)
+        self.update_empty_label()
 
-        self.current_song_list = songs
-        
-        if not songs:
-            msg = "No songs found." if self.all_songs else "Library empty. Go download some!"
-            self.list_layout.addWidget(QLabel(msg, alignment=Qt.AlignCenter))
-            return
-
-        for index, song in enumerate(songs):
-            item = LibraryItem(song)
-            item.play_clicked.connect(lambda s=song, idx=index: self.on_item_play(idx))
-            self.list_layout.addWidget(item)
+    def update_empty_label(self):
+        self.lbl_empty.hide()
+        if not self.current_song_list and self.manager.pages is None:
+            self.lbl_empty.setText("No songs found." if len(self.library_sort) else "Library empty. Go download some!")
+            self.lbl_empty.show()
+
+    def append_items(self, songs):
+        self.lbl_empty.hide()
+        self.model.append_songs(songs)
+
+    def show_song_context_menu(self, song_id, global_pos):
+        SongContextMenu.show(self, song_id, global_pos)
     
-    def on_item_play(self, index):
-        self.play_requested.emit(self.current_song_list, index, False)
+    def on_item_play(self, song_id):
+        # Rows shift as songs are added/removed, so resolve the index on click
+        index = self.model.row_of(song_id)
+        if index is not None:
+            self.play_requested.emit(self.model.song_ids(), index, False)
     
     def play_all(self):
         if self.current_song_list:
-            self.play_requested.emit(self.current_song_list, 0, False)
+            self.play_requested.emit(self.model.song_ids(), 0, False)
 
     def shuffle_all(self):
         if self.current_song_list:
-            self.play_requested.emit(self.current_song_list, 0, True)
+            self.play_requested.emit(self.model.song_ids(), 0, True)
 
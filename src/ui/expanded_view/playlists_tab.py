@@ -1,11 +1,12 @@
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QIcon
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QScrollArea, QLabel, QFrame, QGridLayout, QInputDialog, QMenu, QMessageBox
 
 from src.utils.config import Config
 from src.utils.events import global_event_bus
 from src.database.db_manager import DBManager
-from src.ui.components.library_item import LibraryItem
+from src.ui.components.song_list_view import SongListView
+from src.core.pixmap_cache import PixmapCache
 
 class PlaylistsTab(QWidget):
     play_requested = Signal(list, int, bool)
@@ -58,9 +59,16 @@ class PlaylistsTab(QWidget):
         self.details_widget = QWidget()
         self.details_widget.setStyleSheet("background: transparent;")
         self.details_layout = QVBoxLayout(self.details_widget)
-        self.details_layout.setAlignment(Qt.AlignTop)
+        self.details_layout.setContentsMargins(0, 0, 0, 0)
         self.details_layout.setSpacing(5)
 
+        self.lbl_empty = QLabel("Empty Playlist. Right click songs in Library to add here.", alignment=Qt.AlignCenter)
+        self.details_layout.addWidget(self.lbl_empty)
+        self.song_list = SongListView()
+        self.song_list.play_clicked.connect(self.on_song_play)
+        self.song_list.context_menu_requested.connect(self.show_song_context_menu)
+        self.details_layout.addWidget(self.song_list)
+
         self.show_overview()
 
     def load_playlists(self):
@@ -100,8 +108,7 @@ class PlaylistsTab(QWidget):
         layout.setAlignment(Qt.AlignCenter)
         
         icon_lbl = QLabel() 
-        pix = QPixmap(Config.get_icon_path("default_vinyl.png"))
-        icon_lbl.setPixmap(pix.scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        icon_lbl.setPixmap(PixmapCache.instance().get(Config.get_icon_path("default_vinyl.png"), 60))
         icon_lbl.setAlignment(Qt.AlignCenter)
         
         name_lbl = QLabel(pl_data['name'])
@@ -179,6 +186,8 @@ class PlaylistsTab(QWidget):
         self.load_playlists()
 
     def open_playlist(self, pl_data):
+        if self.current_playlist_id != pl_data['id']:
+            self.song_list.model().set_songs([])
         self.current_playlist_id = pl_data['id']
         self.lbl_title.setText(pl_data['name'])
         self.btn_back.show()
@@ -194,27 +203,18 @@ class PlaylistsTab(QWidget):
             self.load_playlist_songs(playlist_id)
 
     def load_playlist_songs(self, playlist_id):
-        for i in range(self.details_layout.count()):
-            item = self.details_layout.itemAt(i).widget()
-            if item: item.deleteLater()
-
         songs = self.db.get_playlist_songs(playlist_id)
-        
-        if not songs:
-            self.details_layout.addWidget(QLabel("Empty Playlist. Right click songs in Library to add here.", alignment=Qt.AlignCenter))
-            return
-            
-        self.current_song_list = songs
-        for idx, song in enumerate(songs):
-            item = LibraryItem(song)
-            
-            item.customContextMenuRequested.disconnect() 
-            item.customContextMenuRequested.connect(lambda pos, s=song, w=item: self.show_song_context_menu(pos, s, w))
-            
-            item.play_clicked.connect(lambda s=song, i=idx: self.play_requested.emit(self.current_song_list, i, False))
-            self.details_layout.addWidget(item)
-
-    def show_song_context_menu(self, pos, song_data, item_widget):
+        self.song_list.model().apply_songs(songs)
+        self.lbl_empty.setVisible(not songs)
+        self.song_list.setVisible(bool(songs))
+
+    def on_song_play(self, song_id):
+        model = self.song_list.model()
+        index = model.row_of(song_id)
+        if index is not None:
+            self.play_requested.emit(model.song_ids(), index, False)
+
+    def show_song_context_menu(self, song_id, global_pos):
         menu = QMenu()
         menu.setStyleSheet("""
             QMenu { background-color: #25262B; border: 1px solid #3E4045; padding: 5px; color: white; }
@@ -222,13 +222,13 @@ class PlaylistsTab(QWidget):
             QMenu::item:selected { background-color: #88C0D0; color: black; }
         """)
         rm_action = menu.addAction("Remove from Playlist")
-        rm_action.triggered.connect(lambda: self.remove_song(song_data))
+        rm_action.triggered.connect(lambda: self.remove_song(song_id))
         
-        menu.exec(item_widget.mapToGlobal(pos))
+        menu.exec(global_pos)
 
-    def remove_song(self, song_data):
+    def remove_song(self, song_id):
         if self.current_playlist_id:
-            self.db.remove_from_playlist(self.current_playlist_id, song_data['filepath'])
+            self.db.remove_from_playlist(self.current_playlist_id, song_id)
             global_event_bus.playlist_content_changed.emit(self.current_playlist_id)
             global_event_bus.playlists_updated.emit()
 
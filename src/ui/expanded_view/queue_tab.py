@@ -1,23 +1,37 @@
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea
 
 from src.core.download_manager import DownloadManager
+from src.core.download_task import TaskState
 from src.ui.components.download_item import DownloadItem
+from src.ui.components.download_group_item import DownloadGroupItem
 
 class QueueTab(QWidget):
     def __init__(self):
         super().__init__()
         self.download_manager = DownloadManager.instance()
+        self.group_items = {} # group id -> DownloadGroupItem
         self.init_ui()
+        self.download_manager.group_added.connect(self.add_group_item)
         self.download_manager.task_added.connect(self.add_download_item)
+        for group in self.download_manager.groups:
+            self.add_group_item(group)
+        for task in self.download_manager.tasks:
+            self.add_download_item(task)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         
+        header_layout = QHBoxLayout()
         lbl_header = QLabel("Download Queue")
         lbl_header.setStyleSheet("font-size: 24px; font-weight: bold; color: white; margin-bottom: 10px;")
-        layout.addWidget(lbl_header)
+        self.lbl_summary = QLabel("")
+        self.lbl_summary.setStyleSheet("color: #666; font-size: 11px;")
+        header_layout.addWidget(lbl_header)
+        header_layout.addStretch()
+        header_layout.addWidget(self.lbl_summary)
+        layout.addLayout(header_layout)
         
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -36,10 +50,32 @@ class QueueTab(QWidget):
         self.lbl_empty.setStyleSheet("color: #666; font-size: 14px;")
         self.list_layout.addWidget(self.lbl_empty)
 
-    def add_download_item(self, worker):
+    def add_group_item(self, group):
         if self.lbl_empty.isVisible():
             self.lbl_empty.hide()
-            
-        item = DownloadItem(worker)
+
+        item = DownloadGroupItem(group)
+        self.group_items[group.id] = item
         self.list_layout.insertWidget(0, item)
 
+    def add_download_item(self, task):
+        if self.lbl_empty.isVisible():
+            self.lbl_empty.hide()
+            
+        if task.group is not None:
+            # Playlist tracks live inside their group's row
+            self.group_items[task.group.id].add_task(task)
+        else:
+            item = DownloadItem(task)
+            self.list_layout.insertWidget(0, item)
+        task.state_changed.connect(self.update_summary)
+        self.update_summary()
+
+    def update_summary(self):
+        counts = {}
+        for task in self.download_manager.tasks:
+            counts[task.state] = counts.get(task.state, 0) + 1
+        parts = [f"{counts[state]} {state}" for state in (TaskState.DOWNLOADING, TaskState.PROCESSING, TaskState.WAITING, TaskState.PAUSED)
+                 if counts.get(state)]
+        self.lbl_summary.setText(" · ".join(parts))
+
@@ -101,6 +101,7 @@ class SearchTab(QWidget):
         for video in results:
             card = SongCard(video)
             card.download_clicked.connect(self.start_download)
+            card.playlist_download_clicked.connect(self.start_playlist_download)
             self.results_layout.addWidget(card)
 
     def handle_error(self, error_msg):
@@ -110,7 +111,13 @@ class SearchTab(QWidget):
 
     def start_download(self, url, title):
         DownloadManager.instance().start_download(url, title)
-        sender_card = self.sender()
+        self.mark_queued(self.sender())
+
+    def start_playlist_download(self, url, title, entries):
+        DownloadManager.instance().start_playlist(url, title, entries)
+        self.mark_queued(self.sender())
+
+    def mark_queued(self, sender_card):
         if sender_card and hasattr(sender_card, 'btn_download'):
             sender_card.update_status("Added to Queue")
             sender_card.btn_download.setEnabled(False)
@@ -1,9 +1,10 @@
 import re
 import requests
 from PySide6.QtCore import Qt, QObject, Signal, QThread
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QMessageBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QMessageBox, QSpinBox, QComboBox
 
 from src.utils.config import Config
+from src.core.download_manager import DownloadManager
 
 class UpdateChecker(QObject):
     finished = Signal(str, bool)
@@ -88,6 +89,43 @@ class SettingsTab(QWidget):
         theme_layout.addWidget(btn_transparent)
         layout.addLayout(theme_layout)
 
+        self.add_section_header(layout, "Downloads")
+
+        downloads_layout = QHBoxLayout()
+        lbl_concurrent = QLabel("Simultaneous Downloads")
+        lbl_concurrent.setStyleSheet("color: #D8DEE9; font-size: 14px;")
+
+        self.spin_concurrent = QSpinBox()
+        self.spin_concurrent.setRange(1, 10)
+        self.spin_concurrent.setValue(DownloadManager.instance().max_concurrent)
+        self.spin_concurrent.setFixedSize(140, 35)
+        self.spin_concurrent.setStyleSheet("QSpinBox { background-color: #3B4252; color: white; border-radius: 4px; border: 1px solid #4C566A; padding: 0 10px; }")
+        self.spin_concurrent.valueChanged.connect(DownloadManager.instance().set_max_concurrent)
+
+        downloads_layout.addWidget(lbl_concurrent)
+        downloads_layout.addStretch()
+        downloads_layout.addWidget(self.spin_concurrent)
+        layout.addLayout(downloads_layout)
+
+        format_layout = QHBoxLayout()
+        lbl_format = QLabel("Audio Format")
+        lbl_format.setStyleSheet("color: #D8DEE9; font-size: 14px;")
+
+        self.combo_format = QComboBox()
+        self.combo_format.addItem("MP3 (192 kbps)", "mp3")
+        self.combo_format.addItem("Original (Opus / M4A)", "native")
+        self.combo_format.setCurrentIndex(self.combo_format.findData(DownloadManager.instance().audio_format))
+        self.combo_format.setFixedSize(180, 35)
+        self.combo_format.setStyleSheet("QComboBox { background-color: #3B4252; color: white; border-radius: 4px; border: 1px solid #4C566A; padding: 0 10px; }")
+        self.combo_format.setToolTip("Original keeps the source stream without re-encoding: faster and lossless, but not MP3")
+        self.combo_format.currentIndexChanged.connect(
+            lambda: DownloadManager.instance().set_audio_format(self.combo_format.currentData()))
+
+        format_layout.addWidget(lbl_format)
+        format_layout.addStretch()
+        format_layout.addWidget(self.combo_format)
+        layout.addLayout(format_layout)
+
         self.add_section_header(layout, "About Rebbit")
         
         info_text = (
@@ -1,6 +1,8 @@
 from PySide6.QtCore import QObject
 
 from src.core.player import Player
+from src.core.song import SongRegistry
+from src.utils.events import global_event_bus
 from src.ui.collapsed_view import CollapsedView
 from src.ui.expanded_view.expanded_view import ExpandedView
 
@@ -24,6 +26,9 @@ class MainController(QObject):
 
         self.expanded_view.library_tab.play_requested.connect(self.handle_play_request)
         self.expanded_view.playlists_tab.play_requested.connect(self.handle_play_request)
+        self.expanded_view.browse_tab.play_requested.connect(self.handle_play_request)
+        global_event_bus.play_next_requested.connect(self.player.play_next)
+        global_event_bus.queue_append_requested.connect(self.player.add_to_queue)
 
         self.collapsed_view.btn_play.clicked.connect(self.player.toggle_play)
         self.collapsed_view.btn_next.clicked.connect(self.player.next)
@@ -36,7 +41,7 @@ class MainController(QObject):
         bar.next_clicked.connect(self.player.next)
         bar.prev_clicked.connect(self.player.prev)
         bar.seek_requested.connect(self.handle_seek)
-        bar.volume_changed.connect(self.player.audio_output.setVolume)
+        bar.volume_changed.connect(self.player.set_volume)
         bar.shuffle_toggled.connect(self.player.toggle_shuffle)
         bar.repeat_toggled.connect(self.player.toggle_repeat)
 
@@ -49,11 +54,11 @@ class MainController(QObject):
         self.player.shuffle_changed.connect(bar.update_shuffle_state)
         self.player.repeat_changed.connect(bar.update_repeat_state)
 
-    def handle_play_request(self, songs, index, shuffle):
+    def handle_play_request(self, song_ids, index, shuffle):
         if shuffle:
             if not self.player.is_shuffle:
                 self.player.toggle_shuffle() 
-        self.player.load_queue(songs, index)
+        self.player.load_queue(song_ids, index)
 
     def handle_seek(self, position):
         self.player.player.setPosition(position)
@@ -66,9 +71,12 @@ class MainController(QObject):
         self.collapsed_view.set_playing_state(is_playing)
         self.expanded_view.player_bar.set_playing(is_playing)
 
-    def sync_song_info(self, song_data):
-        self.collapsed_view.update_song_info(song_data)
-        self.expanded_view.player_bar.update_info(song_data)
+    def sync_song_info(self, song_id):
+        song = SongRegistry.instance().get(song_id)
+        if song is None:
+            return
+        self.collapsed_view.update_song_info(song)
+        self.expanded_view.player_bar.update_info(song)
 
     def sync_duration(self, duration):
         self.collapsed_view.update_duration(duration)
@@ -15,8 +15,33 @@ class Config:
     ASSETS_DIR = BASE_DIR / "assets"
     ICONS_DIR = ASSETS_DIR / "icons"
     STYLES_DIR = ASSETS_DIR / "styles"
+    COVER_CACHE_DIR = ASSETS_DIR / "cache"
     
     DEFAULT_MUSIC_DIR = Path(os.path.expanduser("~")) / "Music" / "Rebbit"
+    AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.opus', '.ogg', '.flac')
+    SCAN_WORKERS = os.cpu_count() or 1
+    SCAN_EXECUTOR = "thread" # "thread" or "process"
+    WATCH_DEBOUNCE_MS = 1500
+    COVER_CACHE_BUDGET = 512 * 1024 * 1024 # covers plus their thumbnails
+    COVER_TOUCH_INTERVAL_MS = 5000 # how often displayed covers' last_used is written
+    PIXMAP_CACHE_BUDGET = 64 * 1024 * 1024 # decoded bytes kept in memory
+    IMAGE_LOADER_THREADS = 2
+
+    DB_PATH = BASE_DIR / "data" / "rebbit.db"
+    DOWNLOAD_STAGING_DIR = BASE_DIR / "data" / "downloads" # raw fetches, outside the scanned library
+    DB_MMAP_SIZE = 256 * 1024 * 1024
+    DB_CACHE_KB = 64 * 1024
+    DB_STATEMENT_CACHE = 256
+    DB_BATCH_SIZE = 500
+    LIBRARY_PAGE_SIZE = 200
+    LIST_DIFF_MAX_MOVES = 500 # beyond this a list update resets the view instead
+    FILTER_DEBOUNCE_MS = 150
+    FILTER_THREAD_MIN = 2000 # narrow result sets at least this big off the GUI thread
+    MAX_CONCURRENT_DOWNLOADS = 3 # downloads running at once; the rest wait in the queue
+    DOWNLOAD_FORMAT = "mp3" # "mp3" re-encodes at 192k; "native" keeps the source Opus/AAC stream
+    POSTPROCESS_WORKERS = os.cpu_count() or 1 # concurrent ffmpeg conversions
+    POSTPROCESS_QUEUE_SIZE = 2 * POSTPROCESS_WORKERS # fetched downloads waiting to convert before fetching stalls
+    PRELOAD_LEAD_MS = 8000 # open and buffer the next track this long before the current one ends
 
     @staticmethod
     def get_update_url() -> str:
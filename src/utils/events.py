@@ -1,8 +1,9 @@
 from PySide6.QtCore import QObject, Signal
 
 class EventBus(QObject):
-    library_updated = Signal() # When new songs are downloaded
     playlists_updated = Signal() # When a playlist is created/renamed/deleted
     playlist_content_changed = Signal(int) # When songs are added/removed from a specific playlist ID
+    play_next_requested = Signal(int) # Song id to play after the current one
+    queue_append_requested = Signal(int) # Song id to add to the end of the play queue
 global_event_bus = EventBus() # Global instance to be imported elsewhere
 
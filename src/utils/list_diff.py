@@ -0,0 +1,80 @@
+from bisect import bisect_left
+
+def longest_increasing_subsequence(values):
+    # Patience sorting, O(n log n); returns the positions of one LIS
+    tails = []
+    tail_positions = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(i)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = i
+        previous[i] = tail_positions[slot - 1] if slot else -1
+    result = []
+    i = tail_positions[-1] if tail_positions else -1
+    while i != -1:
+        result.append(i)
+        i = previous[i]
+    return result[::-1]
+
+def diff(old_ids, new_ids, max_moves=None):
+    """Operations that turn old_ids into new_ids, applied in order:
+    ('remove', row, count), ('move', from_row, to_row), ('insert', row, ids).
+    Rows refer to the list as it is after the preceding operations. Only
+    items outside a longest increasing run are moved, so the number of moves
+    is minimal. Returns None if more than max_moves moves would be needed."""
+    new_index = {item: i for i, item in enumerate(new_ids)}
+    ops = []
+
+    # 1. Removals, back to front in contiguous runs
+    current = list(old_ids)
+    row = len(current) - 1
+    while row >= 0:
+        if current[row] in new_index:
+            row -= 1
+            continue
+        end = row
+        while row >= 0 and current[row] not in new_index:
+            row -= 1
+        ops.append(('remove', row + 1, end - row))
+        del current[row + 1:end + 1]
+
+    # 2. Moves: everything kept but not on the LIS of target positions
+    targets = [new_index[item] for item in current]
+    stable = {current[i] for i in longest_increasing_subsequence(targets)}
+    movers = sorted((item for item in current if item not in stable), key=new_index.get)
+    if max_moves is not None and len(movers) > max_moves:
+        return None
+    placed = set(stable)
+    for item in movers:
+        source = current.index(item)
+        del current[source]
+        # Land right after the nearest earlier item (in the new order) that is
+        # already in its final relative place; inserts come later
+        destination = 0
+        for earlier in reversed(new_ids[:new_index[item]]):
+            if earlier in placed:
+                destination = current.index(earlier) + 1
+                break
+        current.insert(destination, item)
+        placed.add(item)
+        if destination != source:
+            ops.append(('move', source, destination))
+
+    # 3. Inserts, front to back in contiguous runs; by now everything present
+    #    is in final order, so a new item's target row is its final index
+    present = set(current)
+    row = 0
+    while row < len(new_ids):
+        if new_ids[row] in present:
+            row += 1
+            continue
+        start = row
+        while row < len(new_ids) and new_ids[row] not in present:
+            row += 1
+        ops.append(('insert', start, new_ids[start:row]))
+    return ops
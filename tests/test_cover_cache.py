@@ -0,0 +1,71 @@
+import os
+import sqlite3
+
+import pytest
+
+from src.core.cover_cache import CoverCache
+from src.database import migrations
+from src.utils.config import Config
+
+
+class FakeDB:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get_connection(self):
+        return self.conn
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'COVER_CACHE_DIR', tmp_path)
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    migrations.migrate(conn)
+    return FakeDB(conn)
+
+
+def add_cover(db, data, refcount, last_used, thumb_bytes=0):
+    path = CoverCache.store(data)
+    if thumb_bytes:
+        with open(os.path.splitext(path)[0] + '_40.jpg', 'wb') as thumb:
+            thumb.write(b'x' * thumb_bytes)
+    with db.conn:
+        db.conn.execute('INSERT INTO covers (path, hash, size, refcount, last_used) VALUES (?, ?, ?, ?, ?)',
+                        (path, CoverCache.digest_of(path), len(data), refcount, last_used))
+    return path
+
+
+def test_under_budget_keeps_everything(db):
+    unused = add_cover(db, b'a' * 100, 0, '2026-01-01')
+    CoverCache.collect_garbage(db, budget=1000)
+    assert os.path.exists(unused)
+
+
+def test_referenced_covers_are_never_evicted(db):
+    used = add_cover(db, b'a' * 100, 1, '2020-01-01')
+    old = add_cover(db, b'b' * 100, 0, '2025-01-01')
+    new = add_cover(db, b'c' * 100, 0, '2026-01-01')
+    CoverCache.collect_garbage(db, budget=200)
+    assert os.path.exists(used)
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+    paths = {row[0] for row in db.conn.execute('SELECT path FROM covers')}
+    assert paths == {used, new}
+
+
+def test_thumbnails_count_against_budget(db):
+    used = add_cover(db, b'a' * 100, 1, '2026-01-01', thumb_bytes=500)
+    unused = add_cover(db, b'b' * 100, 0, '2025-01-01')
+    CoverCache.collect_garbage(db, budget=650)
+    assert os.path.exists(used)
+    assert not os.path.exists(unused)
+
+
+def test_thumbnails_of_referenced_covers_go_last(db):
+    old = add_cover(db, b'a' * 100, 1, '2025-01-01', thumb_bytes=500)
+    new = add_cover(db, b'b' * 100, 1, '2026-01-01', thumb_bytes=500)
+    CoverCache.collect_garbage(db, budget=800)
+    assert os.path.exists(old) and os.path.exists(new)
+    assert CoverCache.thumbnails(old) == []
+    assert CoverCache.thumbnails(new) != []
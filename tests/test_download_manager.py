@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QObject, Signal
+
+from src.core import download_manager
+from src.core.download_manager import DownloadManager
+from src.core.download_task import TaskState
+from src.utils.config import Config
+
+
+class FakeWorker(QObject):
+    # Stands in for DownloadWorker/PostProcessWorker; the test decides when
+    # the "thread" finishes
+    progress = Signal(str)
+    partial_file = Signal(str)
+    moving = Signal(str)
+    finished = Signal()
+    started = []
+
+    def __init__(self, *args):
+        super().__init__()
+        self.args = args
+        self.aborted = False
+        self.completed = False
+        self.error_message = None
+        self.partial_files = set()
+        self.downloads = []
+
+    def start(self):
+        FakeWorker.started.append(self)
+
+    def abort(self):
+        self.aborted = True
+
+    def finish(self, completed=True):
+        self.completed = completed and not self.aborted
+        self.finished.emit()
+
+
+@pytest.fixture
+def manager(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'test.db')
+    monkeypatch.setattr(Config, 'DOWNLOAD_STAGING_DIR', tmp_path / 'staging')
+    monkeypatch.setattr(download_manager, 'DownloadWorker', FakeWorker)
+    monkeypatch.setattr(download_manager, 'PostProcessWorker', FakeWorker)
+    FakeWorker.started = []
+    manager = DownloadManager()
+    manager.set_max_concurrent(1)
+    return manager
+
+
+def fetching(manager):
+    return [task.title for task in manager.fetching]
+
+
+def test_fifo_within_priority(manager):
+    a, b, c = (manager.start_download(f'url-{t}', t) for t in 'abc')
+    assert fetching(manager) == ['a']
+    a.worker.finish()
+    assert fetching(manager) == ['b']
+
+
+def test_paused_waiting_task_keeps_its_place(manager):
+    a, b, c = (manager.start_download(f'url-{t}', t) for t in 'abc')
+    manager.pause(b)
+    manager.resume(b)
+    a.worker.finish()
+    assert fetching(manager) == ['b']
+
+
+def test_resume_before_worker_stops_keeps_its_place(manager):
+    a, b = (manager.start_download(f'url-{t}', t) for t in 'ab')
+    worker = a.worker
+    manager.pause(a)
+    manager.resume(a)
+    assert a.state == TaskState.WAITING
+    worker.finish()
+    assert a.state == TaskState.DOWNLOADING
+    assert fetching(manager) == ['a']
+
+
+def test_higher_priority_goes_first(manager):
+    a = manager.start_download('url-a', 'a')
+    manager.start_download('url-b', 'b')
+    manager.start_download('url-c', 'c', priority=5)
+    a.worker.finish()
+    assert fetching(manager) == ['c']
+
+
+def test_group_percent_holds_when_task_is_resumed(manager):
+    group = manager.start_playlist('url-list', 'list', [{'url': f'url-{t}', 'title': t} for t in 'ab'])
+    a, b = group.tasks
+    a.worker.progress.emit('50%')
+    assert group.percent() == 25
+    manager.pause(a)
+    manager.resume(a)
+    assert a.state == TaskState.WAITING
+    assert group.percent() == 25
+
+
+def saved_row(manager, task):
+    manager.flush()
+    return manager.db.get_connection().execute('SELECT * FROM downloads WHERE id = ?', (task.id,)).fetchone()
+
+
+def test_partial_files_are_saved_while_fetching(manager):
+    a = manager.start_download('url-a', 'a')
+    a.worker.partial_file.emit('/staging/a.webm.part')
+    assert json.loads(saved_row(manager, a)['partial_files']) == ['/staging/a.webm.part']
+
+
+def test_restored_download_cleans_up_fetched_files(manager, tmp_path):
+    media, thumb = tmp_path / 'a.webm', tmp_path / 'a.jpg'
+    media.write_bytes(b'audio')
+    thumb.write_bytes(b'image')
+    a = manager.start_download('url-a', 'a')
+    a.worker.downloads = [{'filepath': str(media), 'thumbnails': [{'filepath': str(thumb)}]}]
+    a.worker.finish()
+    assert a.state == TaskState.PROCESSING
+    assert json.loads(saved_row(manager, a)['fetched_files']) == [str(media), str(thumb)]
+
+    restored = DownloadManager()
+    task = restored.tasks[0]
+    restored.cancel(task)
+    task.worker.finish(completed=False)
+    assert task.state == TaskState.CANCELLED
+    assert not media.exists() and not thumb.exists()
+
+
+def test_tasks_fetch_into_their_own_staging_folder(manager, tmp_path):
+    manager.set_max_concurrent(2)
+    a, b = manager.start_download('url-a', 'Song'), manager.start_download('url-b', 'Song')
+    assert a.worker.args[1] != b.worker.args[1]
+    staging = tmp_path / 'staging' / str(a.id)
+    staging.mkdir(parents=True)
+    (staging / 'Song.webm.part').write_bytes(b'audio')
+    manager.cancel(a)
+    a.worker.finish(completed=False)
+    assert not staging.exists()
+
+
+def test_restore_completes_task_already_moved_into_library(manager, qapp, tmp_path):
+    a = manager.start_download('url-a', 'a')
+    a.worker.finish()
+    assert a.state == TaskState.PROCESSING
+    target = tmp_path / 'a.mp3'
+    # The real worker emits from its own thread and waits for the save
+    emitter = threading.Thread(target=a.worker.moving.emit, args=(str(target),))
+    emitter.start()
+    while emitter.is_alive():
+        time.sleep(0.01)
+        qapp.processEvents()
+    target.write_bytes(b'audio')
+
+    FakeWorker.started = []
+    restored = DownloadManager()
+    assert restored.tasks[0].state == TaskState.COMPLETED
+    assert FakeWorker.started == []
+
+
+def test_restore_reprocesses_task_whose_move_never_happened(manager, qapp, tmp_path):
+    a = manager.start_download('url-a', 'a')
+    a.worker.finish()
+    manager.on_moving(a, str(tmp_path / 'a.mp3'))
+
+    restored = DownloadManager()
+    assert restored.tasks[0].state == TaskState.DOWNLOADING
+
+
+def test_cancel_wins_over_a_finished_post_process(manager, tmp_path):
+    a = manager.start_download('url-a', 'a')
+    a.worker.finish()
+    target = tmp_path / 'a.mp3'
+    target.write_bytes(b'audio')
+    a.library_files.append(str(target))
+    worker = a.worker
+    manager.cancel(a)
+    worker.completed = True
+    worker.finished.emit()
+    assert a.state == TaskState.CANCELLED
+    assert not target.exists()
@@ -0,0 +1,29 @@
+from src.core.downloader import PostProcessWorker
+
+
+def test_move_to_library(tmp_path):
+    staging, library = tmp_path / 'staging', tmp_path / 'library'
+    staging.mkdir()
+    library.mkdir()
+    (staging / 'Song.m4a').write_bytes(b'audio')
+    worker = PostProcessWorker([], 'native', str(library))
+    target = worker.move_to_library(str(staging / 'Song.m4a'))
+    assert target == str(library / 'Song.m4a')
+    assert (library / 'Song.m4a').read_bytes() == b'audio'
+    assert list(staging.iterdir()) == []
+    assert [p.name for p in library.iterdir()] == ['Song.m4a']
+
+
+def test_move_to_library_keeps_existing_songs(tmp_path):
+    staging, library = tmp_path / 'staging', tmp_path / 'library'
+    staging.mkdir()
+    library.mkdir()
+    (library / 'Song.m4a').write_bytes(b'old')
+    (library / 'Song (2).m4a').write_bytes(b'older')
+    (staging / 'Song.m4a').write_bytes(b'new')
+    worker = PostProcessWorker([], 'native', str(library))
+    target = worker.move_to_library(str(staging / 'Song.m4a'))
+    assert target == str(library / 'Song (3).m4a')
+    assert (library / 'Song.m4a').read_bytes() == b'old'
+    assert (library / 'Song (3).m4a').read_bytes() == b'new'
+    assert sorted(p.name for p in library.iterdir()) == ['Song (2).m4a', 'Song (3).m4a', 'Song.m4a']
@@ -0,0 +1,36 @@
+import time
+
+from PySide6.QtCore import QObject
+
+from src.core.image_loader import ImageLoader
+from src.core.thumbnails import ThumbnailService
+
+
+def test_missing_cover_is_not_retried_on_repaint(qapp, tmp_path):
+    loader = ImageLoader()
+    thumbs = ThumbnailService.instance()
+    owner = QObject()
+    cover_path = str(tmp_path / 'missing.jpg')
+    results = []
+
+    def repaint(pixmap):
+        # What a view does on delivery: paint again, which fetches again
+        results.append(pixmap)
+        loader.fetch_cover(owner, cover_path, 50, repaint)
+
+    assert loader.fetch_cover(owner, cover_path, 50, repaint) is None
+    loader.pool.waitForDone()
+    for _ in range(20):
+        time.sleep(0.01)
+        qapp.processEvents()
+        assert loader.fetch_cover(owner, cover_path, 50, repaint) is None
+    assert len(results) == 1 and results[0].isNull()
+    assert (cover_path, 50) in loader.failed
+    assert cover_path in thumbs.failed and cover_path not in thumbs.pending
+
+
+def test_new_thumbnail_clears_failure(qapp):
+    loader = ImageLoader()
+    loader.failed = {('a.jpg', 50), ('a.jpg', 160), ('b.jpg', 50)}
+    loader.forget_failed('a.jpg')
+    assert loader.failed == {('b.jpg', 50)}
@@ -0,0 +1,21 @@
+import pytest
+
+from src.core.library_manager import LibraryManager
+from src.utils.config import Config
+
+
+@pytest.fixture
+def manager(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'test.db')
+    monkeypatch.setattr(Config, 'DEFAULT_MUSIC_DIR', tmp_path / 'music')
+    return LibraryManager()
+
+
+def test_metadata_edit_emits_song_update(manager):
+    manager.db.add_songs([{'title': 'Old', 'artist': 'A', 'album': 'B', 'filepath': '/music/old.mp3'}])
+    song_id = manager.db.get_ids_by_paths(['/music/old.mp3'])[0]
+    updates = []
+    manager.songs_updated.connect(updates.append)
+
+    assert manager.update_song_metadata(song_id, 'New', 'A', 'B', None)
+    assert [(song.id, song.title) for songs in updates for song in songs] == [(song_id, 'New')]
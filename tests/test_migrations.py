@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+from src.database import migrations
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    migrations.migrate(conn)
+    yield conn
+    conn.close()
+
+
+def test_migrates_empty_database_to_latest(conn):
+    assert migrations.get_version(conn) == migrations.LATEST_VERSION
+
+
+def test_query_plans(conn):
+    assert migrations.check_plans(conn) == []
+
+
+def test_every_migration_has_plan_check():
+    assert [m.version for m in migrations.MIGRATIONS if not m.plan_checks] == []
+
+
+def test_migrate_is_idempotent(conn):
+    migrations.migrate(conn)
+    assert migrations.get_version(conn) == migrations.LATEST_VERSION
+
+
+def test_missing_index_is_reported(conn):
+    conn.execute('DROP INDEX idx_songs_album')
+    failures = migrations.check_plans(conn)
+    assert failures
+    assert all('idx_songs_album' in failure for failure in failures)
+
+
+def test_sort_in_temp_btree_is_reported():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE artists (name TEXT)')
+    migration = migrations.Migration(0, [], plan_checks=[
+        ('SELECT * FROM artists ORDER BY name', (), 'NOT USE TEMP B-TREE'),
+    ])
+    assert migrations.check_plans(conn, [migration])
+
+
+@pytest.mark.parametrize('filepath, title', [
+    ('/music/Artist/Song.mp3', 'Song.mp3'),
+    ('C:\\Music\\Song.m4a', 'Song.m4a'),
+    ('Song.opus', 'Song.opus'),
+])
+def test_missing_titles_are_backfilled_with_file_name(monkeypatch, filepath, title):
+    conn = sqlite3.connect(':memory:')
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS[:3])
+    migrations.migrate(conn)
+    conn.execute('INSERT INTO songs (title, filepath) VALUES (NULL, ?)', (filepath,))
+    conn.commit()
+    monkeypatch.undo()
+    migrations.migrate(conn)
+    assert conn.execute('SELECT title FROM songs').fetchone()[0] == title
+
+
+def test_concurrent_migrate_skips_applied_versions(tmp_path, monkeypatch):
+    path = str(tmp_path / 'race.db')
+    first = sqlite3.connect(path, isolation_level=None)
+    second = sqlite3.connect(path, isolation_level=None)
+    migrations.migrate(first)
+
+    # `second` read user_version before `first` committed
+    real_get_version = migrations.get_version
+    reads = []
+
+    def get_version(conn):
+        reads.append(conn)
+        return 0 if len(reads) == 1 else real_get_version(conn)
+
+    monkeypatch.setattr(migrations, 'get_version', get_version)
+    migrations.migrate(second)
+    assert real_get_version(second) == migrations.MIGRATIONS[-1].version
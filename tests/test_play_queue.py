@@ -0,0 +1,187 @@
+import random
+
+import pytest
+
+from src.core.play_queue import PlayQueue
+
+
+class ListModel:
+    # The same queue kept in plain lists of handles, edited the obvious
+    # (linear) way. Shuffle draws are random, so when the queue draws new
+    # slots the model checks they are a permutation and adopts them.
+    def __init__(self, queue):
+        self.queue = queue
+        self.songs = []
+        self.base = []
+        self.play = None
+        self.pos = -1
+
+    @property
+    def order(self):
+        return self.base if self.play is None else self.play
+
+    def new_handles(self, song_ids):
+        start = len(self.songs)
+        self.songs.extend(song_ids)
+        return list(range(start, len(self.songs)))
+
+    def load(self, song_ids, start, shuffle):
+        self.songs, self.base, self.play = [], [], None
+        self.base = self.new_handles(song_ids)
+        self.pos = start if song_ids else -1
+        self.queue.load(song_ids, start)
+        if shuffle:
+            self.set_shuffle(True)
+
+    def set_shuffle(self, enabled):
+        current = self.order[self.pos] if self.pos >= 0 else None
+        self.queue.set_shuffle(enabled)
+        if enabled and self.play is None:
+            self.play = self.adopt_draws([], list(self.base))
+            if current is not None:
+                assert self.play[0] == current
+            self.pos = min(self.pos, 0)
+        elif not enabled and self.play is not None:
+            self.play = None
+            self.pos = self.base.index(current) if current is not None else -1
+
+    def adopt_draws(self, decided, undecided):
+        self.queue.decide(len(self.queue) - 1)
+        drawn = list(self.queue.play)
+        assert drawn[:len(decided)] == decided
+        assert sorted(drawn[len(decided):]) == sorted(undecided)
+        return drawn
+
+    def insert_next(self, song_ids):
+        handles = self.new_handles(song_ids)
+        if self.play is None:
+            self.base[self.pos + 1:self.pos + 1] = handles
+        else:
+            at = self.base.index(self.play[self.pos]) + 1 if self.pos >= 0 else 0
+            self.base[at:at] = handles
+            self.play[self.pos + 1:self.pos + 1] = handles
+        self.queue.insert_next(song_ids)
+
+    def append(self, song_ids):
+        handles = self.new_handles(song_ids)
+        self.base.extend(handles)
+        self.queue.append(song_ids)
+        if self.play is not None:
+            self.play = self.adopt_draws(self.play, handles)
+
+    def remove(self, index):
+        handle = self.order.pop(index)
+        if self.play is not None:
+            self.base.remove(handle)
+        if index <= self.pos:
+            self.pos -= 1
+        self.queue.remove(index)
+
+    def move(self, source, destination):
+        order = self.order
+        order.insert(destination, order.pop(source))
+        if source == self.pos:
+            self.pos = destination
+        elif source < self.pos <= destination:
+            self.pos -= 1
+        elif destination <= self.pos < source:
+            self.pos += 1
+        self.queue.move(source, destination)
+
+    def step(self, delta, wrap):
+        expected = self.pos + delta
+        if not 0 <= expected < len(self.base):
+            if wrap and self.base:
+                expected = 0 if delta == 1 else len(self.base) - 1
+            else:
+                expected = None
+        peeked = self.queue.peek_next(wrap) if delta == 1 else None
+        moved = self.queue.next(wrap) if delta == 1 else self.queue.prev(wrap)
+        if expected is None:
+            assert moved is None
+        else:
+            self.pos = expected
+            assert moved == self.songs[self.order[expected]]
+            if delta == 1:
+                assert peeked == moved
+
+    def check(self):
+        queue = self.queue
+        assert len(queue) == len(self.base)
+        assert list(queue.base) == self.base
+        assert queue.ids() == [self.songs[h] for h in self.order]
+        assert queue.pos == self.pos
+        assert queue.current() == (self.songs[self.order[self.pos]] if self.pos >= 0 else None)
+        labels = [queue.labels[h] for h in queue.base]
+        assert labels == sorted(set(labels))
+        if queue.shuffled:
+            assert all(queue.base_index(h) == i for i, h in enumerate(self.base))
+
+
+def random_ops(model, rng, steps):
+    next_id = iter(range(10**6, 10**7))
+    for _ in range(steps):
+        size = len(model.base)
+        op = rng.random()
+        if op < 0.05:
+            count = rng.randrange(0, 40)
+            model.load([next(next_id) for _ in range(count)], rng.randrange(count) if count else 0, rng.random() < 0.5)
+        elif op < 0.15:
+            model.set_shuffle(not model.queue.shuffled)
+        elif op < 0.35:
+            # Repeated inserts at one spot exhaust the label gap
+            model.insert_next([next(next_id) for _ in range(rng.randrange(1, 4))])
+        elif op < 0.45:
+            model.append([next(next_id) for _ in range(rng.randrange(1, 4))])
+        elif op < 0.6 and size:
+            model.remove(rng.randrange(size))
+        elif op < 0.75 and size:
+            model.move(rng.randrange(size), rng.randrange(size))
+        elif op < 0.85 and size:
+            index = rng.randrange(size)
+            assert model.queue.jump(index) == model.songs[model.order[index]]
+            model.pos = index
+        else:
+            model.step(1 if rng.random() < 0.7 else -1, rng.random() < 0.5)
+        model.check()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_list_model(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    model = ListModel(PlayQueue())
+    model.load(list(range(20)), 5, False)
+    model.check()
+    random_ops(model, rng, 500)
+
+
+def test_duplicate_songs_keep_their_own_entries():
+    queue = PlayQueue()
+    queue.load([7, 7, 7], start=1)
+    queue.remove(1)
+    assert queue.ids() == [7, 7]
+    assert queue.pos == 0
+
+
+def test_unshuffle_lands_on_current_entry():
+    random.seed(0)
+    queue = PlayQueue()
+    queue.load(list(range(100)), start=40, shuffle=True)
+    assert queue.current() == 40
+    for _ in range(10):
+        queue.next()
+    current = queue.current()
+    queue.set_shuffle(False)
+    assert queue.current() == current
+    assert queue.pos == current
+
+
+def test_inserts_at_one_spot_relabel():
+    queue = PlayQueue()
+    queue.load([0, 1], start=0)
+    for song_id in range(100, 300):
+        queue.insert_next([song_id])
+    assert queue.ids() == [0] + list(range(299, 99, -1)) + [1]
+    labels = [queue.labels[h] for h in queue.base]
+    assert labels == sorted(set(labels))